@@ -0,0 +1,67 @@
+""" How parsing a BoI-sized rates sheet scales with worker processes.
+
+Run from the repo root: `python -m benchmarks.bench_boiexcel_parallel`
+
+Builds a synthetic sheet of every business day over 25 years for 40
+currencies, then times the serial parsers against the parallel ones at
+increasing process counts, checking each gives the same output.
+"""
+
+from datetime import date as Date, timedelta as TimeDelta
+import os
+import random
+import sys
+import time
+
+from fx.boiexcel import \
+    STRF_BOI, parse_all, parse_single, parse_all_parallel, \
+    parse_single_parallel
+
+YEARS = 25
+CURRENCIES = 40
+
+
+def synthetic_rows(years: int = YEARS, currencies: int = CURRENCIES):
+    rnd = random.Random(0)
+    symbols = ['', ''] + [f"C{i:02d}" for i in range(currencies)]
+    rows = [symbols]
+    day = Date(1999, 1, 4)
+    end = day + TimeDelta(days=365 * years)
+    while day < end:
+        if day.weekday() < 5:
+            rows.append(['', day.strftime(STRF_BOI)]
+                        + [f"{rnd.uniform(0.5, 200):.4f}"
+                           for _ in range(currencies)])
+        day += TimeDelta(days=1)
+    return rows
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = list(fn(*args))
+    return time.perf_counter() - start, result
+
+
+def main(max_processes: int):
+    rows = synthetic_rows()
+    print(f"{len(rows) - 1} rows x {CURRENCIES} currencies")
+
+    serial_all, expected_all = timed(parse_all, rows)
+    serial_one, expected_one = timed(parse_single, 'C00', rows)
+    print(f"{'processes':>9} {'parse_all':>10} {'speedup':>8}"
+          f" {'parse_single':>13} {'speedup':>8}")
+    print(f"{'serial':>9} {serial_all:10.3f} {1:8.2f}"
+          f" {serial_one:13.3f} {1:8.2f}")
+
+    processes = 2
+    while processes <= max_processes:
+        t_all, got_all = timed(parse_all_parallel, rows, processes)
+        t_one, got_one = timed(parse_single_parallel, 'C00', rows, processes)
+        assert got_all == expected_all and got_one == expected_one
+        print(f"{processes:>9} {t_all:10.3f} {serial_all / t_all:8.2f}"
+              f" {t_one:13.3f} {serial_one / t_one:8.2f}")
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1)
@@ -0,0 +1,110 @@
+""" Constant-time aggregates of an FX rate series over any date range.
+
+Sums come from a table of exact cumulative `Decimal` sums, so the mean over
+[start, end] is one subtraction and one division. Minimum and maximum come
+from sparse tables: the min of two overlapping power-of-two spans covering
+the range.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date as Date, timedelta as TimeDelta
+from typing import Callable, Iterable, List, Tuple, Union
+
+from . import Rate
+from .error import RateNotAvailableError
+from .fx import FxSingle
+
+
+def _sparse_table(values: List[Rate], pick: Callable) -> List[List[Rate]]:
+    """ Row k holds pick() over each span of 2**k values. """
+    table = [values]
+    span = 1
+    while span * 2 <= len(values):
+        prev = table[-1]
+        table.append([pick(prev[i], prev[i + span])
+                      for i in range(len(prev) - span)])
+        span *= 2
+    return table
+
+
+class RateAggregateIndex:
+    """ Index a rate series for fast windowed count/sum/mean/min/max. """
+
+    def __init__(self, table: Iterable[Tuple[Date, Rate]]):
+        """
+        :param table: iterable over tuples of date to rate.
+        """
+        loaded = sorted(table)
+        self._dates: List[Date] = [date for date, _ in loaded]
+        rates = [rate for _, rate in loaded]
+        self._sums: List[Rate] = [Rate(0)]
+        for rate in rates:
+            self._sums.append(self._sums[-1] + rate)
+        self._mins = _sparse_table(rates, min)
+        self._maxes = _sparse_table(rates, max)
+
+    @classmethod
+    def from_fx(cls, fx: FxSingle, start: Date, end: Date) \
+            -> "RateAggregateIndex":
+        """ Index the rates an `FxSingle` has between two dates. """
+        return cls(fx.iter_rates_over_date_range(start, end))
+
+    def _span(self, start: Date, end: Date) -> Tuple[int, int]:
+        """ Index range [lo, hi) of the rates dated within [start, end]. """
+        lo = bisect_left(self._dates, start)
+        hi = bisect_right(self._dates, end)
+        if lo >= hi:
+            raise RateNotAvailableError(
+                f"No exchange rates between {start} and {end}"
+            )
+        return lo, hi
+
+    def _query(self, table: List[List[Rate]], pick: Callable,
+               start: Date, end: Date) -> Rate:
+        lo, hi = self._span(start, end)
+        k = (hi - lo).bit_length() - 1
+        row = table[k]
+        return pick(row[lo], row[hi - (1 << k)])
+
+    def count(self, start: Date, end: Date) -> int:
+        """ Number of rates between two dates, inclusive. """
+        lo = bisect_left(self._dates, start)
+        hi = bisect_right(self._dates, end)
+        return max(hi - lo, 0)
+
+    def sum(self, start: Date, end: Date) -> Rate:
+        lo, hi = self._span(start, end)
+        return self._sums[hi] - self._sums[lo]
+
+    def mean(self, start: Date, end: Date) -> Rate:
+        """ Mean of the rates between two dates, inclusive. """
+        lo, hi = self._span(start, end)
+        return (self._sums[hi] - self._sums[lo]) / (hi - lo)
+
+    def min(self, start: Date, end: Date) -> Rate:
+        return self._query(self._mins, min, start, end)
+
+    def max(self, start: Date, end: Date) -> Rate:
+        return self._query(self._maxes, max, start, end)
+
+    def rolling_mean(self, window: Union[int, TimeDelta]) \
+            -> List[Tuple[Date, Rate]]:
+        """ Mean over the trailing window ending at every date in the series.
+
+        :param window: length of the window in days (or a timedelta),
+            including the day itself; e.g. 30 for a 30-day rolling average.
+        :return: date, mean of the rates dated within the window ending then.
+        """
+        if not isinstance(window, TimeDelta):
+            window = TimeDelta(days=window)
+        if window.days < 1:
+            raise ValueError("Window must be at least one day")
+        dates, sums = self._dates, self._sums
+        result = []
+        lo = 0
+        for hi, date in enumerate(dates, 1):
+            first = date - window + TimeDelta(days=1)
+            while dates[lo] < first:
+                lo += 1
+            result.append((date, (sums[hi] - sums[lo]) / (hi - lo)))
+        return result
@@ -3,15 +3,23 @@
 Available here: https://www.centralbank.ie/statistics/interest-rates-exchange-rates/exchange-rates
 """
 
-from typing import Iterable, Iterator, Mapping, Tuple, Optional, Sequence, Any
+from typing import \
+    Iterable, Iterator, Mapping, Tuple, Optional, Sequence, Any, List
 from datetime import date as Date, datetime as DateTime
+from concurrent.futures import ProcessPoolExecutor
 import decimal
+import heapq
+import math
+import os
 
 from dictionaries import FrozenOrderedDict
 import pyexcel
 
+from .memprofile import stage
+
 from . import Sym, Rate
 from .memory import MemoryFxSingle
+from .cross import MemoryFxCross
 
 # typedefs
 FxRow = Tuple[Date, Mapping[Sym, Rate]]
@@ -22,6 +30,13 @@ STRF_BOI = "%d %b %y"
 # Number of digits after decimal point for Rate
 RATE_ROUND_DIGITS = 5
 
+# Fewest data rows worth sending to another process
+MIN_CHUNK_ROWS = 1000
+
+# Which workbook's rate wins when several have the same date
+PRECEDENCE_FIRST = 'first'  # the earliest in the list of workbooks
+PRECEDENCE_LAST = 'last'    # the latest in the list of workbooks
+
 
 def convert_rate(rate: str) -> Optional[Rate]:
     try:
@@ -34,13 +49,18 @@ def iter_excel(file_name: str) -> Iterator[FxRow]:
     """ Iterate over BoI fxrates Excel sheet.
     :param file_name: path and name of BoI fxrates Excel file.
     """
-    book = pyexcel.get_book(file_name=file_name)
+    with stage('fx.iter_excel.get_book'):
+        book = pyexcel.get_book(file_name=file_name)
     sheet = book.sheet_by_index(0)  # The first sheet has the rates we want
     rows = iter(sheet.rows())       # Iterate over its rows
     next(rows)                      # Skip row of spoken names of currencies
     yield from rows
 
 
+def _is_blank(row: Sequence[Any]) -> bool:
+    return all(not str(c) for c in row)
+
+
 def parse_all(rows: Iterable[Sequence[Any]]) -> Iterable[FxRow]:
     """ Get exchange rates for all known currencies on all dates available.
     :param rows:
@@ -51,7 +71,7 @@ def parse_all(rows: Iterable[Sequence[Any]]) -> Iterable[FxRow]:
     symbols = next(rows)[2:]  # first row is symbols; we want these
     # now we get to dates -> rates
     for row in rows:
-        if all(not str(c) for c in row):
+        if _is_blank(row):
             # exit at blank row
             break
         date, rates = row[1], row[2:]
@@ -97,9 +117,178 @@ def parse_single(symbol: Sym, rows: Iterable[FxRow]) \
         yield date, rate
 
 
-def load_single(file_name, symbol: Sym):
-    """ Load FX data from a BoI daily rates workbook for a single currency. """
+#
+# Parallel parsing
+#
+# The data rows are cut off at the first blank row, exactly where the serial
+# parser would stop, then split into contiguous chunks. Each chunk is parsed
+# by the serial parser in a worker process, with the symbols row prepended,
+# so every other rule (skipped dates and so on) is the same by construction.
+# Chunks come back in order, so concatenating them keeps the dates sorted.
+#
+
+def _chunks(data: Sequence[Sequence[Any]], processes: int,
+            chunk_size: Optional[int]) -> List[Sequence[Sequence[Any]]]:
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_ROWS, math.ceil(len(data) / processes))
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def _parse_all_chunk(symbols: Sequence[Any], chunk: Sequence[Sequence[Any]]) \
+        -> List[Tuple[Date, List[Tuple[Sym, Rate]]]]:
+    # FrozenOrderedDicts don't pickle, so send back plain lists
+    return [(date, list(fx.items()))
+            for date, fx in parse_all([symbols] + list(chunk))]
+
+
+def _parse_single_chunk(symbol: Sym, symbols: Sequence[Any],
+                        chunk: Sequence[Sequence[Any]]) \
+        -> List[Tuple[Date, Rate]]:
+    return list(parse_single(symbol, [symbols] + list(chunk)))
+
+
+def parse_all_parallel(rows: Iterable[Sequence[Any]],
+                       processes: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> Iterator[FxRow]:
+    """ As `parse_all`, but parsing chunks of rows in a process pool.
+
+    :param rows: as for `parse_all`.
+    :param processes: number of worker processes; default one per CPU.
+    :param chunk_size: data rows per chunk; default an equal share per
+        process, but no fewer than `MIN_CHUNK_ROWS`.
+    """
+    rows = list(rows)
+    symbols, data = rows[0], rows[1:]
+    end = next((i for i, row in enumerate(data) if _is_blank(row)), None)
+    chunks = _chunks(data[:end], processes or os.cpu_count() or 1, chunk_size)
+    if len(chunks) <= 1 or processes == 1:
+        yield from parse_all(rows)
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        parsed = pool.map(_parse_all_chunk, [symbols] * len(chunks), chunks)
+        for chunk in parsed:
+            for date, fx in chunk:
+                yield date, FrozenOrderedDict(fx)
+
+
+def parse_single_parallel(symbol: Sym, rows: Iterable[Sequence[Any]],
+                          processes: Optional[int] = None,
+                          chunk_size: Optional[int] = None) \
+        -> Iterator[Tuple[Date, Rate]]:
+    """ As `parse_single`, but parsing chunks of rows in a process pool.
+
+    :param symbol: as for `parse_single`.
+    :param rows: as for `parse_single`.
+    :param processes: number of worker processes; default one per CPU.
+    :param chunk_size: data rows per chunk; default an equal share per
+        process, but no fewer than `MIN_CHUNK_ROWS`.
+    """
+    rows = list(rows)
+    symbols, data = rows[0], rows[1:]
+    norm_symbols = [x.strip().upper() for x in symbols]
+    if symbol not in norm_symbols:
+        raise ValueError(f"Symbol '{symbol}' not in {', '.join(norm_symbols)}")
+    sym_idx = norm_symbols.index(symbol)
+    end = next((i for i, row in enumerate(data)
+                if not row[1] and not row[sym_idx]), None)
+    chunks = _chunks(data[:end], processes or os.cpu_count() or 1, chunk_size)
+    if len(chunks) <= 1 or processes == 1:
+        yield from parse_single(symbol, rows)
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        parsed = pool.map(_parse_single_chunk, [symbol] * len(chunks),
+                          [symbols] * len(chunks), chunks)
+        for chunk in parsed:
+            yield from chunk
+
+
+def load_single(file_name, symbol: Sym, processes: int = 1):
+    """ Load FX data from a BoI daily rates workbook for a single currency.
+
+    :param processes: parse in this many processes; None for one per CPU.
+    """
     symbol = symbol.strip().upper()
+    with stage('fx.load_single') as profiled:
+        rates_src = iter_excel(file_name)
+        if processes == 1:
+            rates = parse_single(symbol, rates_src)
+        else:
+            rates = parse_single_parallel(symbol, rates_src, processes)
+        fx = MemoryFxSingle(symbol, rates)
+        profiled.rows = len(fx)
+    return fx
+
+
+def _ordered(rows: Iterable[Tuple[Date, Rate]]) \
+        -> Iterator[Tuple[Date, Rate]]:
+    """ Pass rows through, checking they're in date order. """
+    last = None
+    for date, rate in rows:
+        if last is not None and date < last:
+            raise ValueError(f"Rates out of date order: {date} after {last}")
+        last = date
+        yield date, rate
+
+
+def merge_sorted(streams: Sequence[Iterable[Tuple[Date, Rate]]],
+                 precedence: str = PRECEDENCE_FIRST) \
+        -> Iterator[Tuple[Date, Rate]]:
+    """ K-way merge of date-ordered rate streams into one.
+
+    Only the head of each stream is held, on a heap, so this is a single
+    linear pass however many streams there are.
+
+    :param streams: iterables of date, rate; each in date order.
+    :param precedence: on a date in more than one stream, whether the rate
+        from the `PRECEDENCE_FIRST` or `PRECEDENCE_LAST` stream is kept.
+    :raises ValueError: if a stream isn't in date order.
+    """
+    if precedence == PRECEDENCE_FIRST:
+        sign = 1
+    elif precedence == PRECEDENCE_LAST:
+        sign = -1
+    else:
+        raise ValueError(f"Unknown precedence '{precedence}'")
+
+    def tagged(rank, stream):
+        # the position breaks ties within a stream so rates aren't compared
+        for position, (date, rate) in enumerate(_ordered(stream)):
+            yield date, rank, position, rate
+
+    merged = heapq.merge(*(tagged(sign * i, stream)
+                           for i, stream in enumerate(streams)))
+    last = None
+    for date, _, _, rate in merged:
+        if date != last:  # the first of each date has the precedence
+            last = date
+            yield date, rate
+
+
+def load_single_many(file_names: Sequence[str], symbol: Sym,
+                     precedence: str = PRECEDENCE_FIRST) -> MemoryFxSingle:
+    """ Load FX data for a single currency from many BoI rates workbooks.
+
+    Each workbook is streamed through the parser and the already-sorted
+    streams merged, so the history is built without a sort.
+
+    :param file_names: paths of BoI daily rates workbooks.
+    :param symbol: the currency to load.
+    :param precedence: see `merge_sorted`.
+    """
+    symbol = symbol.strip().upper()
+    streams = [parse_single(symbol, iter_excel(f)) for f in file_names]
+    rates = merge_sorted(streams, precedence)
+    return MemoryFxSingle(symbol, rates, presorted=True)
+
+
+def load_cross(file_name, processes: int = 1) -> MemoryFxCross:
+    """ Load FX data from a BoI daily rates workbook for all currencies.
+
+    :param processes: parse in this many processes; None for one per CPU.
+    """
     rates_src = iter_excel(file_name)
-    rates = parse_single(symbol, rates_src)
-    return MemoryFxSingle(symbol, rates)
+    if processes == 1:
+        rates = parse_all(rates_src)
+    else:
+        rates = parse_all_parallel(rates_src, processes)
+    return MemoryFxCross(rates)
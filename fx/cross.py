@@ -0,0 +1,127 @@
+""" Cross rates between any two currencies quoted against a common one.
+
+The BoI quotes every currency against the Euro. The rate between any other
+two is the ratio of their Euro rates on the same date, e.g. GBP per USD is
+(GBP per EUR) / (USD per EUR).
+"""
+
+from datetime import date as Date
+from typing import (
+    Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+)
+
+from . import Sym, Rate, Currency
+from .error import RateNotAvailableError
+from .memory import MemoryFxSingle
+
+# typedefs
+Pair = Tuple[Sym, Sym]
+Series = Sequence[Optional[Rate]]  # aligned with the shared date index
+
+
+class MemoryFxCross:
+    """ Keep multi-currency FX rates in memory and convert between any pair.
+
+    All currencies share a single sorted date index. Each (base, quote)
+    pair's series is computed the first time it's asked for and cached, so a
+    conversion costs one date lookup and one multiplication.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Date, Mapping[Sym, Rate]]],
+                 primary: Sym = 'EUR'):
+        """
+        :param rows: date, mapping of symbol to rate against the primary,
+            as from `boiexcel.parse_all`.
+        :param primary: the symbol every rate is quoted against.
+        """
+        self._primary = primary.strip().upper()
+        loaded = sorted(rows, key=lambda row: row[0])
+        self._dates: Tuple[Date, ...] = tuple(date for date, _ in loaded)
+        self._index: Dict[Date, int] = {d: i for i, d in enumerate(self._dates)}
+        symbols = sorted({sym for _, fx in loaded for sym in fx})
+        self._columns: Dict[Sym, Series] = {
+            sym: tuple(fx.get(sym) for _, fx in loaded) for sym in symbols
+        }
+        self._columns[self._primary] = (Rate(1),) * len(loaded)
+        self._pairs: Dict[Pair, Series] = {}
+
+    @property
+    def symbols(self) -> List[Sym]:
+        return sorted(self._columns)
+
+    @property
+    def dates(self) -> Sequence[Date]:
+        return self._dates
+
+    def _column(self, symbol: Sym) -> Series:
+        try:
+            return self._columns[symbol]
+        except KeyError:
+            raise RateNotAvailableError(f"No rates for {symbol}") from None
+
+    def series(self, base: Sym, quote: Sym) -> Series:
+        """ Rates of quote per 1 base, aligned with `dates`.
+
+        None where either currency has no rate on that date.
+        """
+        pair = base.strip().upper(), quote.strip().upper()
+        try:
+            return self._pairs[pair]
+        except KeyError:
+            pass
+        base_col, quote_col = self._column(pair[0]), self._column(pair[1])
+        series = tuple(
+            q / b if b and q else None for b, q in zip(base_col, quote_col)
+        )
+        self._pairs[pair] = series
+        return series
+
+    def _at(self, series: Series, date: Date, pair: Pair) -> Rate:
+        i = self._index.get(date)
+        rate = None if i is None else series[i]
+        if rate is None:
+            raise RateNotAvailableError(
+                f"Exchange rate at {date} for {pair[0]}/{pair[1]} "
+                f"not available"
+            )
+        return rate
+
+    def rate_at_date(self, base: Sym, quote: Sym, date: Date) -> Rate:
+        """ How many of `quote` one `base` bought at the given date. """
+        return self._at(self.series(base, quote), date, (base, quote))
+
+    def convert(self, base: Sym, quote: Sym, date: Date, amount: Currency) \
+            -> Currency:
+        """ Convert an amount of `base` to `quote` at the given date. """
+        return amount * self.rate_at_date(base, quote, date)
+
+    def convert_many(self, base: Sym, quote: Sym,
+                     amounts: Iterable[Tuple[Date, Currency]]) \
+            -> List[Currency]:
+        """ Convert many dated amounts of `base` to `quote`.
+
+        :raises RateNotAvailableError: if any date has no rate for the pair.
+        """
+        series = self.series(base, quote)
+        pair = base, quote
+        return [amount * self._at(series, date, pair)
+                for date, amount in amounts]
+
+    def iter_rates_over_date_range(self, base: Sym, quote: Sym,
+                                   start: Date, end: Date) \
+            -> Iterator[Tuple[Date, Rate]]:
+        """ All the pair's known rates between two dates, inclusive. """
+        for date, rate in zip(self._dates, self.series(base, quote)):
+            if date > end:
+                break
+            if date >= start and rate is not None:
+                yield date, rate
+
+    def pair(self, base: Sym, quote: Sym) -> MemoryFxSingle:
+        """ An `FxSingle` with `base` as its "primary" currency. """
+        return MemoryFxSingle(
+            base,
+            ((date, rate) for date, rate in zip(self._dates,
+                                                self.series(base, quote))
+             if rate is not None)
+        )
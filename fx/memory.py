@@ -3,6 +3,8 @@ from typing import Iterable, Tuple, Iterator
 
 from dictionaries import FrozenOrderedDict
 
+from .memprofile import stage
+
 from .fx import FxSingle, Sym, Rate
 from .error import RateNotAvailableError
 
@@ -10,16 +12,31 @@ from .error import RateNotAvailableError
 class MemoryFxSingle(FxSingle):
     """ Load a table in memory. """
 
-    def __init__(self, symbol: Sym, table: Iterable[Tuple[Date, Rate]]):
+    def __init__(self, symbol: Sym, table: Iterable[Tuple[Date, Rate]],
+                 presorted: bool = False):
         """ Keep an FX rate table in memory.
 
         :param symbol: the Fx symbol of the "primary" currency, e.g. "EUR"
         :param table: iterable over tuples of date to rate.
+        :param presorted: the table is already in date order with no
+            duplicate dates, so it needn't be collected and sorted first.
         """
         super().__init__(symbol)
+        with stage('fx.MemoryFxSingle') as profiled:
+            self._table = self._make_table(table, presorted)
+            profiled.rows = len(self._table)
+
+    @staticmethod
+    def _make_table(table: Iterable[Tuple[Date, Rate]], presorted: bool) \
+            -> FrozenOrderedDict:
+        if presorted:
+            return FrozenOrderedDict(table)
         loaded = list(table)
         loaded.sort()
-        self._table = FrozenOrderedDict(loaded)
+        return FrozenOrderedDict(loaded)
+
+    def __len__(self) -> int:
+        return len(self._table)
 
     def rate_at_date(self, date: Date) -> Rate:
         """ Get the exchange rate at the given date. """
@@ -41,6 +58,6 @@ class MemoryFxSingle(FxSingle):
                     yield date, rate
                 break
         for date, rate in rows:
-            if date >= end:
+            if date > end:
                 break
             yield date, rate
@@ -0,0 +1,144 @@
+""" Opt-in memory profiling of the loaders, built on `tracemalloc`.
+
+The loaders mark their stages with `stage()`. Normally that does nothing;
+inside `profiling()` each stage records how much memory it allocated at its
+peak and how much it still held at its end, and, where it says how many
+rows (sales, lots, FX rows) it produced, the retained bytes per row:
+
+    with profiling() as profile:
+        fx = load_single('fxrates.xls', 'USD')
+    print(profile.report())
+
+Stages nest, e.g. `fx.iter_excel` runs inside `fx.load_single`; an outer
+stage's figures include its inner stages'.
+
+Memory is counted after a garbage collection at each stage's start and end,
+as pyexcel's books are in reference cycles and otherwise linger, looking
+retained, until the collector happens to run.
+
+A profile is per thread: it records only the stages run by the thread that
+started it, so e.g. the spcd server's watch thread loading books doesn't
+push its stages onto the main thread's. `tracemalloc` counts the whole
+process though, so for true figures profile while other threads are idle.
+
+A stage's peak needs `tracemalloc.reset_peak`, new in Python 3.9. On older
+versions peaks are reported as None; retained bytes are still recorded.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional
+import gc
+import threading
+import tracemalloc
+
+# The profile being recorded by each thread, if any, as its `profile`
+_active = threading.local()
+
+# Whether each stage's peak can be measured (Python 3.9+)
+CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+class StageStats(NamedTuple):
+    name: str
+    peak: Optional[int]  # most bytes allocated at once during the stage
+    retained: int        # bytes allocated during the stage and still held
+    rows: Optional[int] = None
+
+    @property
+    def retained_per_row(self) -> Optional[float]:
+        return self.retained / self.rows if self.rows else None
+
+
+class _Frame:
+    """ What a stage knows about itself while it runs. """
+
+    __slots__ = ('start', 'peak', 'rows')
+
+    def __init__(self, start: int = 0):
+        self.start = start
+        self.peak = start
+        self.rows: Optional[int] = None
+
+
+class Profile:
+    """ The stages recorded during a `profiling()` block, in finishing order.
+    """
+
+    def __init__(self):
+        self.stages: List[StageStats] = []
+        self._stack: List[_Frame] = []
+
+    def __getitem__(self, name: str) -> StageStats:
+        """ The last finished stage with the given name. """
+        for stats in reversed(self.stages):
+            if stats.name == name:
+                return stats
+        raise KeyError(name)
+
+    def report(self) -> str:
+        lines = [f"{'stage':<32} {'peak':>12} {'retained':>12}"
+                 f" {'rows':>8} {'B/row':>8}"]
+        for s in self.stages:
+            per_row = '' if s.retained_per_row is None \
+                else f"{s.retained_per_row:.0f}"
+            rows = '' if s.rows is None else s.rows
+            peak = '' if s.peak is None else f"{s.peak:,}"
+            lines.append(f"{s.name:<32} {peak:>12} {s.retained:>12,}"
+                         f" {rows:>8} {per_row:>8}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    """ Record loader stages' memory use within the block.
+
+    Starts `tracemalloc` if it isn't already running, and stops it again
+    afterwards if it was started here.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    previous = getattr(_active, 'profile', None)
+    profile = _active.profile = Profile()
+    try:
+        yield profile
+    finally:
+        _active.profile = previous
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[_Frame]:
+    """ Mark a loader stage; set `rows` on what it yields to get per-row use.
+
+    Costs next to nothing unless a `profiling()` block is active.
+    """
+    profile = getattr(_active, 'profile', None)
+    if profile is None:
+        yield _Frame()
+        return
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    stack = profile._stack
+    if stack:
+        # the peak is about to be reset, so bank the outer stage's so far
+        stack[-1].peak = max(stack[-1].peak, peak)
+    if CAN_RESET_PEAK:
+        tracemalloc.reset_peak()
+    frame = _Frame(current)
+    stack.append(frame)
+    try:
+        yield frame
+    finally:
+        stack.pop()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame.peak)
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        profile.stages.append(StageStats(
+            name, peak - frame.start if CAN_RESET_PEAK else None,
+            current - frame.start, frame.rows
+        ))
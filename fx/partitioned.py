@@ -0,0 +1,164 @@
+""" FX rates stored as one file per year, loaded only when needed.
+
+Most questions are about the current and last tax years, so there's no need
+to hold the BoI history back to 1999 in memory. Split it once:
+
+    write_partitions('rates/', 'USD', parse_single('USD', iter_excel(f)))
+
+then `PartitionedFxSingle('USD', 'rates/')` reads a year's file the first
+time a query touches that year, keeping only the most recently used few.
+Newer rates can be written the same way later; they're merged into the
+year's partition, and a reader notices a new year by itself, or call its
+`refresh` to drop partitions it already read.
+"""
+
+from collections import OrderedDict
+from datetime import date as Date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import re
+import threading
+
+from . import Sym, Rate
+from .error import RateNotAvailableError
+from .fx import FxSingle
+from .memory import MemoryFxSingle
+
+# Default number of year partitions held in memory at once
+MAX_RESIDENT = 2
+
+
+def partition_file_name(symbol: Sym, year: int) -> str:
+    return f"{symbol}-{year:04d}.tsv"
+
+
+def write_partitions(directory: str, symbol: Sym,
+                     rates: Iterable[Tuple[Date, Optional[Rate]]]) \
+        -> List[int]:
+    """ Split a rate series into one file per year.
+
+    Each file holds lines of ISO date, tab, rate, in date order. Rates are
+    merged into an existing partition for their year, replacing any on the
+    same dates, so a series of only the latest rates tops a year up.
+
+    :param directory: where to write the partition files.
+    :param symbol: the currency of the rates, e.g. "USD".
+    :param rates: date, rate pairs, e.g. from `boiexcel.parse_single`.
+    :return: the years written.
+    """
+    symbol = symbol.strip().upper()
+    by_year: Dict[int, Dict[Date, Rate]] = {}
+    for date, rate in rates:
+        if rate is not None:
+            by_year.setdefault(date.year, {})[date] = rate
+    os.makedirs(directory, exist_ok=True)
+    for year, year_rates in by_year.items():
+        path = os.path.join(directory, partition_file_name(symbol, year))
+        if os.path.exists(path):
+            year_rates = {**dict(read_partition(path)), **year_rates}
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as fh:
+            for date in sorted(year_rates):
+                fh.write(f"{date.isoformat()}\t{year_rates[date]}\n")
+        os.replace(tmp, path)  # readers never see a partial partition
+    return sorted(by_year)
+
+
+def read_partition(path: str) -> Iterator[Tuple[Date, Rate]]:
+    with open(path) as fh:
+        for line in fh:
+            date, rate = line.rstrip('\n').split('\t')
+            yield Date.fromisoformat(date), Rate(rate)
+
+
+class PartitionedFxSingle(FxSingle):
+    """ Rates for a currency read per year from partition files on demand.
+    """
+
+    def __init__(self, symbol: Sym, directory: str,
+                 max_resident: int = MAX_RESIDENT):
+        """
+        :param symbol: the currency of the partitions, e.g. "USD".
+        :param directory: where `write_partitions` wrote them.
+        :param max_resident: most year partitions to keep in memory; the
+            least recently used is dropped to make room for another.
+        """
+        super().__init__(symbol)
+        if max_resident < 1:
+            raise ValueError("Need room for at least one partition")
+        self._directory = directory
+        self._max_resident = max_resident
+        self._resident: "OrderedDict[int, MemoryFxSingle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pattern = re.compile(
+            rf"^{re.escape(self._symbol)}-(\d{{4}})\.tsv$"
+        )
+        self.years = self._list_years()
+
+    def _list_years(self) -> List[int]:
+        years = sorted(
+            int(m.group(1))
+            for m in map(self._pattern.match, os.listdir(self._directory))
+            if m
+        )
+        self.years = years
+        return years
+
+    def refresh(self):
+        """ Re-list the partition files and drop those already in memory, so
+        rates written since are seen.
+        """
+        with self._lock:
+            self._resident.clear()
+        self._list_years()
+
+    @property
+    def resident(self) -> List[int]:
+        """ Years currently in memory, least recently used first. """
+        return list(self._resident)
+
+    def _partition(self, year: int) -> Optional[MemoryFxSingle]:
+        with self._lock:
+            partition = self._resident.get(year)
+            if partition is not None:
+                self._resident.move_to_end(year)
+                return partition
+        if year not in self.years and year not in self._list_years():
+            return None
+        path = os.path.join(self._directory,
+                            partition_file_name(self._symbol, year))
+        partition = MemoryFxSingle(self._symbol, read_partition(path),
+                                   presorted=True)
+        with self._lock:
+            self._resident[year] = partition
+            self._resident.move_to_end(year)
+            while len(self._resident) > self._max_resident:
+                self._resident.popitem(last=False)
+        return partition
+
+    def rate_at_date(self, date: Date) -> Rate:
+        """ Get the exchange rate at the given date. """
+        partition = self._partition(date.year)
+        if partition is None:
+            raise RateNotAvailableError(
+                f"Exchange rate at {date} for {self._symbol} not available"
+            )
+        return partition.rate_at_date(date)
+
+    def iter_rates_over_date_range(self, start: Date, end: Date) \
+            -> Iterator[Tuple[Date, Rate]]:
+        """ Get all the rates of the currency between two dates, inclusive.
+
+        Partitions are loaded one year at a time as the range reaches them.
+        """
+        years = self.years
+        if not years or start.year < years[0] or end.year > years[-1]:
+            years = self._list_years()  # the range may reach a new year
+        for year in years:
+            if year < start.year:
+                continue
+            if year > end.year:
+                break
+            partition = self._partition(year)
+            if partition is not None:
+                yield from partition.iter_rates_over_date_range(start, end)
@@ -0,0 +1,60 @@
+from datetime import date as Date
+from typing import Iterable, Tuple, Iterator, Optional
+import threading
+
+from .fx import FxSingle, Sym, Rate
+from .memory import MemoryFxSingle
+from .error import RateNotAvailableError
+
+
+class ReloadableFxSingle(FxSingle):
+    """ An in-memory FX rate table that can be replaced while in use.
+
+    A reload builds a complete new `MemoryFxSingle` off to the side, then
+    publishes it by rebinding a single attribute, which is atomic. Readers
+    take that snapshot once per call, so they never block on a reload and
+    never see a half-built table. A range iteration keeps to the snapshot it
+    started with even if a reload happens part way through.
+    """
+
+    def __init__(self, symbol: Sym,
+                 table: Optional[Iterable[Tuple[Date, Rate]]] = None):
+        """
+        :param symbol: the Fx symbol of the "primary" currency, e.g. "EUR"
+        :param table: optional initial iterable over tuples of date to rate.
+        """
+        super().__init__(symbol)
+        self._reload_lock = threading.Lock()  # writers only
+        self._snapshot: Optional[MemoryFxSingle] = None
+        self.generation = 0
+        if table is not None:
+            self.reload(table)
+
+    def reload(self, table: Iterable[Tuple[Date, Rate]]) -> int:
+        """ Replace the whole rate table.
+        :param table: iterable over tuples of date to rate.
+        :return: the generation number of the newly published table.
+        """
+        with self._reload_lock:
+            snapshot = MemoryFxSingle(self._symbol, table)
+            self._snapshot = snapshot
+            self.generation += 1
+            return self.generation
+
+    def snapshot(self) -> MemoryFxSingle:
+        """ The currently published table; unaffected by later reloads. """
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RateNotAvailableError(
+                f"No rates loaded yet for {self._symbol}"
+            )
+        return snapshot
+
+    def rate_at_date(self, date: Date) -> Rate:
+        """ Get the exchange rate at the given date. """
+        return self.snapshot().rate_at_date(date)
+
+    def iter_rates_over_date_range(self, start: Date, end: Date) \
+            -> Iterator[Tuple[Date, Rate]]:
+        """ Get all the rates of the currency between two dates, inclusive. """
+        return self.snapshot().iter_rates_over_date_range(start, end)
@@ -0,0 +1,103 @@
+""" Persist FX rate series in a local SQLite database.
+
+Dates are stored as ISO text and rates as the text of the `Decimal`, so
+nothing is lost to floating point and dates still sort correctly.
+
+Run `create_schema` once on a new database (or use `open_store`). Saving
+joins a transaction the caller already has open, so several saves can be
+committed or rolled back together; otherwise each save commits by itself.
+"""
+
+from contextlib import contextmanager
+from datetime import date as Date
+from typing import Iterable, Iterator, Optional, Tuple
+import sqlite3
+
+from . import Sym, Rate
+from .memory import MemoryFxSingle
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS fx_rates (
+        symbol  TEXT NOT NULL,
+        date    TEXT NOT NULL,
+        rate    TEXT NOT NULL,
+        PRIMARY KEY (symbol, date)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def create_schema(conn: sqlite3.Connection):
+    """ Create the tables if they're missing.
+
+    Statements are run one at a time, as `executescript` would commit any
+    transaction the caller has open.
+    """
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    """ Connect to a database file, creating the tables if need be. """
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    conn.commit()
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """ Join the caller's open transaction, or else run in one of our own.
+    """
+    if conn.in_transaction:
+        yield conn  # the caller commits or rolls back
+    else:
+        with conn:
+            yield conn
+
+
+def save_rates(conn: sqlite3.Connection, symbol: Sym,
+               rates: Iterable[Tuple[Date, Optional[Rate]]]) -> int:
+    """ Insert or replace a currency's rates, see `transaction`.
+    :param conn: open database connection.
+    :param symbol: the currency the rates are for, e.g. "USD".
+    :param rates: date, rate pairs, e.g. from `boiexcel.parse_single`.
+    :return: number of rates written.
+    """
+    symbol = symbol.strip().upper()
+    rows = [(symbol, date.isoformat(), str(rate))
+            for date, rate in rates if rate is not None]
+    with transaction(conn):
+        conn.executemany(
+            "INSERT INTO fx_rates (symbol, date, rate) VALUES (?, ?, ?) "
+            "ON CONFLICT (symbol, date) DO UPDATE SET rate = excluded.rate",
+            rows
+        )
+    return len(rows)
+
+
+def iter_rates(conn: sqlite3.Connection, symbol: Sym,
+               start: Optional[Date] = None, end: Optional[Date] = None) \
+        -> Iterable[Tuple[Date, Rate]]:
+    """ A currency's stored rates in date order, optionally within dates. """
+    sql = "SELECT date, rate FROM fx_rates WHERE symbol = ?"
+    params = [symbol.strip().upper()]
+    if start is not None:
+        sql += " AND date >= ?"
+        params.append(start.isoformat())
+    if end is not None:
+        sql += " AND date <= ?"
+        params.append(end.isoformat())
+    sql += " ORDER BY date"
+    for date, rate in conn.execute(sql, params):
+        yield Date.fromisoformat(date), Rate(rate)
+
+
+def load_single(conn: sqlite3.Connection, symbol: Sym,
+                start: Optional[Date] = None, end: Optional[Date] = None) \
+        -> MemoryFxSingle:
+    """ Load a currency's stored rates, like `boiexcel.load_single`. """
+    symbol = symbol.strip().upper()
+    return MemoryFxSingle(symbol, iter_rates(conn, symbol, start, end),
+                          presorted=True)
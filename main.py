@@ -5,6 +5,7 @@ from datetime import date as Date
 
 from mssb_spc.book import load_book
 from mssb_spc.error import BookParseError
+from mssb_spc.sniff import sniff_book
 from fx.boiexcel import load_single
 
 MSSB_PATH = os.environ.get('MSSB_DATA', '.')
@@ -15,8 +16,12 @@ def print_sales(folder: str):
     print(folder)
     for file_name in os.listdir(folder):
         if file_name.endswith('.xls'):
+            path = os.path.join(folder, file_name)
+            if not sniff_book(path).is_sale:
+                print(f"... not a sale: '{file_name}'")
+                continue
             try:
-                book = load_book(file_name=os.path.join(folder, file_name))
+                book = load_book(file_name=path)
             except BookParseError:
                 print(f"\n\n... SKIPPING FILE '{file_name}'\n\n")
                 continue
@@ -1,41 +1,72 @@
 from typing import MutableMapping
 import pyexcel
 
+from fx.memprofile import stage
+
 from .sale import sale_sheet_to_dict
 from .espp import espp_sheet_to_espps
 from .rsu import rsu_sheet_to_rsus
-from .common import PlanType
+from .common import PlanType, LazyRecord, LOT_FIELDS
 from .error import BookParseError, SaleSheetParseError
 
 
-def book_to_sale(book: pyexcel.Book) -> MutableMapping:
+def book_to_sale(book: pyexcel.Book, lazy: bool = False) -> MutableMapping:
     """ Extracts RSU/ESPP sale data from a SPC Sale Excel workbook.
 
     :param book: the loaded workbook
+    :param lazy: give `LazyRecord`s, translating values only when read.
     :return: all the data relevant to the sale.
     :raises BookParseError: if sale type couldn't be determined.
     :raises SaleSheetParseError: if first sheet couldn't be parsed as a sale.
     """
     # Convert the sale sheet
     sale_sheet = book.sheet_by_index(0)
-    sale: MutableMapping = sale_sheet_to_dict(sale_sheet)
+    sale: MutableMapping = sale_sheet_to_dict(sale_sheet, lazy)
 
     if sale['plan_type'] is PlanType.RSU:
         rsu_sheet = book.sheet_by_index(1)
-        sale['rsus'] = rsu_sheet_to_rsus(rsu_sheet)
+        sale['rsus'] = rsu_sheet_to_rsus(rsu_sheet, lazy)
     elif sale['plan_type'] is PlanType.ESPP:
         espp_sheet = book.sheet_by_index(1)
-        sale['espps'] = espp_sheet_to_espps(espp_sheet)
+        sale['espps'] = espp_sheet_to_espps(espp_sheet, lazy)
     else:
         raise BookParseError("Couldn't determine sale type of book")
 
     return sale
 
 
-def load_book(file_name):
-    """ Load sale data from a workbook. Convert it to a sale. """
-    book = pyexcel.get_book(file_name=file_name)
-    sale = book_to_sale(book)
+def load_book(file_name, lazy: bool = False):
+    """ Load sale data from a workbook. Convert it to a sale.
+
+    :param lazy: give `LazyRecord`s, translating values only when read. Use
+        `materialise_sale` to translate (and so validate) everything.
+    """
+    with stage('mssb_spc.load_book.get_book'):
+        book = pyexcel.get_book(file_name=file_name)
+    with stage('mssb_spc.load_book.book_to_sale') as profiled:
+        sale = book_to_sale(book, lazy)
+        profiled.rows = 1
     sale['_from_file'] = file_name
     return sale
 
+
+def materialise_sale(sale: MutableMapping) -> MutableMapping:
+    """ Translate every field of a lazily loaded sale and its lots.
+
+    The sale given is left as it is, whether lazy or already plain.
+
+    :return: a copy of the sale and its lots as plain dicts.
+    :raises: whatever a translator raises for a bad cell.
+    """
+    if isinstance(sale, LazyRecord):
+        sale = sale.materialise()
+    else:
+        sale = dict(sale)
+    for lot_field in LOT_FIELDS:
+        if lot_field in sale:
+            sale[lot_field] = [
+                lot.materialise() if isinstance(lot, LazyRecord)
+                else dict(lot)
+                for lot in sale[lot_field]
+            ]
+    return sale
@@ -0,0 +1,199 @@
+""" An indexed, queryable collection of parsed sales and their lots.
+
+Sorted indexes answer date ranges with a bisect; hash indexes answer
+equality with a dict lookup. A query intersects the candidates from its
+indexed filters, smallest first, and only then tests anything else.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import (
+    Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set,
+    Tuple
+)
+
+from .common import LOT_FIELDS
+
+# Fields of sales kept in sorted indexes
+SALE_SORTED_FIELDS = ('trade_date', 'settlement_date')
+
+# Fields of lots kept in sorted indexes
+LOT_SORTED_FIELDS = ('acquired_date',)
+
+# Fields of sales kept in hash indexes
+SALE_HASH_FIELDS = ('stock_symbol', 'plan_type', 'order_number')
+
+
+class Range(NamedTuple):
+    """ Filter on a value between two bounds, inclusive; None is unbounded.
+    """
+    start: Any = None
+    end: Any = None
+
+    def __contains__(self, value) -> bool:
+        if value is None:
+            return False
+        if self.start is not None and value < self.start:
+            return False
+        if self.end is not None and value > self.end:
+            return False
+        return True
+
+
+class _SortedIndex:
+    """ Ids ordered by a field's value, for range lookups. """
+
+    def __init__(self):
+        self._keys: List[Tuple[Any, int]] = []
+
+    def add(self, value, id_: int):
+        if value is not None:
+            insort(self._keys, (value, id_))
+
+    def bounds(self, r: Range) -> Tuple[int, int]:
+        keys = self._keys
+        lo = 0 if r.start is None else bisect_left(keys, (r.start, -1))
+        hi = len(keys) if r.end is None \
+            else bisect_right(keys, (r.end, float('inf')))
+        return lo, max(lo, hi)
+
+    def ids(self, r: Range) -> Set[int]:
+        lo, hi = self.bounds(r)
+        return {id_ for _, id_ in self._keys[lo:hi]}
+
+
+class _HashIndex:
+    """ Ids by a field's value, for equality lookups. """
+
+    def __init__(self):
+        self._ids: Dict[Any, List[int]] = {}
+
+    def add(self, value, id_: int):
+        if value is not None:
+            self._ids.setdefault(value, []).append(id_)
+
+    def ids(self, value) -> List[int]:
+        return self._ids.get(value, [])
+
+
+class SaleCollection:
+    """ Sales and their lots, indexed as they're added. """
+
+    def __init__(self, sales: Iterable[Mapping] = ()):
+        self._sales: List[Mapping] = []
+        self._lots: List[Tuple[int, Mapping]] = []  # (sale id, lot)
+        self._sale_sorted = {f: _SortedIndex() for f in SALE_SORTED_FIELDS}
+        self._sale_hashed = {f: _HashIndex() for f in SALE_HASH_FIELDS}
+        self._lot_sorted = {f: _SortedIndex() for f in LOT_SORTED_FIELDS}
+        self._lots_of_sale: List[List[int]] = []
+        self.extend(sales)
+
+    def __len__(self) -> int:
+        return len(self._sales)
+
+    def __iter__(self):
+        return iter(self._sales)
+
+    def add(self, sale: Mapping):
+        """ Add a sale (as from `load_book`) and its lots to the indexes. """
+        sale_id = len(self._sales)
+        self._sales.append(sale)
+        for field, index in self._sale_sorted.items():
+            index.add(sale.get(field), sale_id)
+        for field, index in self._sale_hashed.items():
+            index.add(sale.get(field), sale_id)
+        lot_ids = []
+        for lot_field in LOT_FIELDS:
+            for lot in sale.get(lot_field) or ():
+                lot_id = len(self._lots)
+                self._lots.append((sale_id, lot))
+                lot_ids.append(lot_id)
+                for field, index in self._lot_sorted.items():
+                    index.add(lot.get(field), lot_id)
+        self._lots_of_sale.append(lot_ids)
+
+    def extend(self, sales: Iterable[Mapping]):
+        for sale in sales:
+            self.add(sale)
+
+    @staticmethod
+    def _plan(filters: Mapping[str, Any], sorted_indexes, hashed_indexes) \
+            -> Tuple[List[Callable[[], Iterable[int]]], Dict[str, Any]]:
+        """ Split filters into index lookups (cheapest first) and the rest.
+        :return: lookups giving candidate ids, filters left to test.
+        """
+        costed = []
+        rest = {}
+        for field, cond in filters.items():
+            if field in sorted_indexes and cond is not None:
+                if not isinstance(cond, Range):
+                    cond = Range(cond, cond)  # equality is a one-value range
+                index = sorted_indexes[field]
+                lo, hi = index.bounds(cond)
+                costed.append((hi - lo, lambda i=index, c=cond: i.ids(c)))
+            elif not isinstance(cond, Range) and field in hashed_indexes:
+                ids = hashed_indexes[field].ids(cond)
+                costed.append((len(ids), lambda ids=ids: ids))
+            else:
+                rest[field] = cond
+        costed.sort(key=lambda c: c[0])
+        return [lookup for _, lookup in costed], rest
+
+    @staticmethod
+    def _matches(record: Mapping, filters: Mapping[str, Any]) -> bool:
+        for field, cond in filters.items():
+            value = record.get(field)
+            if isinstance(cond, Range):
+                if value not in cond:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    @staticmethod
+    def _candidates(lookups: List[Callable[[], Iterable[int]]]) \
+            -> Optional[Set[int]]:
+        """ Intersect the lookups' ids; None if there were no lookups. """
+        ids = None
+        for lookup in lookups:
+            found = lookup()
+            ids = set(found) if ids is None else ids.intersection(found)
+            if not ids:
+                break
+        return ids
+
+    def _sale_ids(self, filters: Mapping[str, Any]) -> List[int]:
+        lookups, rest = self._plan(filters, self._sale_sorted,
+                                   self._sale_hashed)
+        ids = self._candidates(lookups)
+        ids = range(len(self._sales)) if ids is None else sorted(ids)
+        return [i for i in ids if self._matches(self._sales[i], rest)]
+
+    def sales(self, **filters) -> List[Mapping]:
+        """ Sales matching all the filters, in the order they were added.
+
+        Each filter is `field=value` for equality or `field=Range(a, b)` for
+        a range, e.g. `sales(stock_symbol='XYZ', trade_date=Range(d1, d2))`.
+        """
+        return [self._sales[i] for i in self._sale_ids(filters)]
+
+    def lots(self, sale_filters: Optional[Mapping[str, Any]] = None,
+             **filters) -> List[Tuple[Mapping, Mapping]]:
+        """ Lots matching all the filters, with the sale they're part of.
+
+        :param sale_filters: filters, as for `sales`, on the lots' sales.
+        :param filters: filters on the lots' own fields, as for `sales`.
+        :return: sale, lot pairs.
+        """
+        lookups, rest = self._plan(filters, self._lot_sorted, {})
+        if sale_filters:
+            sale_ids = self._sale_ids(sale_filters)
+            lookups.append(lambda: (lot_id for sale_id in sale_ids
+                                    for lot_id in self._lots_of_sale[sale_id]))
+        ids = self._candidates(lookups)
+        ids = range(len(self._lots)) if ids is None else sorted(ids)
+        found = []
+        for i in ids:
+            sale_id, lot = self._lots[i]
+            if self._matches(lot, rest):
+                found.append((self._sales[sale_id], lot))
+        return found
@@ -1,4 +1,6 @@
-from typing import Union, Optional, Iterable, Iterator, List, Tuple, Mapping
+from typing import \
+    Union, Optional, Iterable, Iterator, List, Tuple, Mapping, Callable, Any
+from collections.abc import MutableMapping
 from decimal import Decimal, InvalidOperation
 from datetime import date as Date, datetime as DateTime
 from re import compile as Re, sub as re_sub
@@ -14,6 +16,7 @@ Cell = Union[str, int, Decimal, Date]  # this is what can be in any table cell
 Row = List[Optional[Cell]]             # this is how a row is made up
 Table = List[Row]                      # a table is an ordered list of rows
 Currency = Decimal                     # Just use a simple Decimal for now
+Translator = Callable[[Cell], Any]     # converts a raw cell to a value
 
 # Regexen
 RE_CURR_CONV_DESC = Re(
@@ -23,6 +26,9 @@ RE_CURR_CONV_DESC = Re(
     r'\s*(?P<dst_sym>[A-Z]{3})\s*$'          # dest symbol (e.g. EUR)
 )
 
+# Sale fields holding the lists of lots sold, by plan type
+LOT_FIELDS = ('rsus', 'espps')
+
 # Datetime format conversions
 STRF_US_DT  = "%m/%d/%Y"  # US middle-endian date format
 STRF_ISO_DT = "%Y-%m-%d"  # ISO big-endian date format
@@ -148,6 +154,83 @@ def xlate_kv(k: str, v: Cell, translators: Mapping[str, Cell] = XLATORS) \
     return k, translator(v)
 
 
+def resolve_keys(keys: Iterable[str], translators=XLATORS) \
+        -> List[Tuple[str, Translator]]:
+    """ Look up the new name and value translator for each original key. """
+    return [translators[norm_key(k)] for k in keys]
+
+
+class LazyRecord(MutableMapping):
+    """ A record whose values are only translated when first read.
+
+    Keys are translated up front, so unknown keys fail as early as they do
+    with `xlate_kv`, but each raw cell is kept until its field is read, then
+    translated once and cached. Most jobs read a few fields of each lot, so
+    they needn't pay for translating all of them.
+    """
+
+    __slots__ = ('_raw', '_values')
+
+    def __init__(self, fields: Iterable[Tuple[str, Translator, Cell]] = ()):
+        """
+        :param fields: new key, value translator and raw cell of each field.
+            As with `dict`, a later field replaces an earlier one of the
+            same key.
+        """
+        self._raw = {}
+        self._values = {}
+        for k, translator, v in fields:
+            self._raw[k] = (translator, v)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, Cell]],
+                   translators=XLATORS) -> "LazyRecord":
+        """ Build from original key, raw cell pairs, like `xlate_kv`. """
+        items = list(items)
+        keys = resolve_keys((k for k, _ in items), translators)
+        return cls((k, translator, v)
+                   for (k, translator), (_, v) in zip(keys, items))
+
+    def __getitem__(self, k: str):
+        try:
+            return self._values[k]
+        except KeyError:
+            pass
+        translator, v = self._raw[k]
+        value = self._values[k] = translator(v)
+        return value
+
+    def __setitem__(self, k: str, value):
+        self._values[k] = value
+
+    def __delitem__(self, k: str):
+        if k not in self._raw and k not in self._values:
+            raise KeyError(k)
+        self._raw.pop(k, None)
+        self._values.pop(k, None)
+
+    def __contains__(self, k) -> bool:
+        # Mapping's would read, and so translate, the value
+        return k in self._raw or k in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._raw
+        yield from (k for k in self._values if k not in self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw) + sum(1 for k in self._values
+                                    if k not in self._raw)
+
+    def materialise(self) -> dict:
+        """ Translate every field now and get them as a plain dict.
+        :raises: whatever a translator raises for a bad cell.
+        """
+        return {k: self[k] for k in self}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.materialise()!r})"
+
+
 #
 # Table mangling
 #
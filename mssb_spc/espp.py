@@ -1,8 +1,12 @@
 from typing import Iterable, MutableMapping, List
-from .common import Table, Cell, xlate_kv, without_empty_columns, content_rows
+from .common import \
+    Table, Cell, xlate_kv, without_empty_columns, content_rows,\
+    resolve_keys, LazyRecord
 
 import pyexcel
 
+from fx.memprofile import stage
+
 
 def espp_sheet_relevant_rows(esppz: Iterable[List[Cell]]) -> Table:
     # Get the relevant rows from the sheet
@@ -10,10 +14,21 @@ def espp_sheet_relevant_rows(esppz: Iterable[List[Cell]]) -> Table:
     return rows
 
 
-def espp_table_to_dicts(esppz: Table) -> Iterable[MutableMapping[str, Cell]]:
-    """ Conversion of a PyExcel Sheet representing ESPP details. """
+def espp_table_to_dicts(esppz: Table, lazy: bool = False) \
+        -> Iterable[MutableMapping[str, Cell]]:
+    """ Conversion of a PyExcel Sheet representing ESPP details.
+
+    :param lazy: give `LazyRecord`s, translating values only when read.
+    """
     rows = iter(esppz)
     headings = next(rows)  # skip headers
+    if lazy:
+        keys = resolve_keys(headings)
+        return [
+            LazyRecord((k, translator, field)
+                       for (k, translator), field in zip(keys, row))
+            for row in rows
+        ]
     esppz = [
         dict(xlate_kv(field_name, field)
              for field_name, field in zip(headings, row))
@@ -22,14 +37,17 @@ def espp_table_to_dicts(esppz: Table) -> Iterable[MutableMapping[str, Cell]]:
     return esppz
 
 
-def espp_sheet_to_espps(espp_sheet: pyexcel.Sheet) \
+def espp_sheet_to_espps(espp_sheet: pyexcel.Sheet, lazy: bool = False) \
         -> List[MutableMapping[str, Cell]]:
     """ Convert an ESPP sheet from Excel into records of ESPPs involved in sale.
 
     :param espp_sheet: sheet from PyExcel
+    :param lazy: give `LazyRecord`s, translating values only when read.
     :return: list of k:v mappings of ESPP data.
     """
-    rows = espp_sheet_relevant_rows(espp_sheet.rows())
-    rows = without_empty_columns(rows)
-    esppz = list(espp_table_to_dicts(rows))
+    with stage('mssb_spc.espp_sheet_to_espps') as profiled:
+        rows = espp_sheet_relevant_rows(espp_sheet.rows())
+        rows = without_empty_columns(rows)
+        esppz = list(espp_table_to_dicts(rows, lazy))
+        profiled.rows = len(esppz)
     return esppz
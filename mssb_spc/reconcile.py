@@ -0,0 +1,142 @@
+""" Check sales' currency conversions against BoI reference rates.
+
+SPC reports the rate it converted the proceeds at as e.g. "1 USD = 0.87 EUR"
+(`conversion_rate`), whereas a BoI rate is the other way around: units of the
+other currency per Euro. So the SPC rate implied by a BoI rate is its inverse.
+"""
+
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Sequence
+from datetime import date as Date
+from decimal import Decimal
+
+from fx.fx import FxSingle
+
+# Relative deviation from the BoI rate above which a sale is flagged
+DEFAULT_THRESHOLD = Decimal('0.01')
+
+
+class RateCheck(NamedTuple):
+    """ The result of checking one sale. """
+    sale: Mapping
+    boi_rate: Decimal             # other currency per 1 primary, from BoI
+    implied_rate: Decimal         # primary per 1 other, i.e. SPC's sense
+    rate_deviation: Optional[Decimal]      # relative, of conversion_rate
+    proceeds_deviation: Optional[Decimal]  # relative, of net_proceeds_reqcurr
+    flagged: bool
+
+
+class Reconciliation(NamedTuple):
+    """ The result of checking a batch of sales. """
+    checks: List[RateCheck]      # every sale a BoI rate was found for
+    unmatched: List[Mapping]     # sales without a BoI rate on settlement
+    unparsed: List[Mapping]      # sales without settlement date or rate
+    threshold: Decimal
+
+    @property
+    def flagged(self) -> List[RateCheck]:
+        return [check for check in self.checks if check.flagged]
+
+    @property
+    def max_deviation(self) -> Optional[Decimal]:
+        deviations = [d for check in self.checks
+                      for d in (check.rate_deviation, check.proceeds_deviation)
+                      if d is not None]
+        return max(deviations) if deviations else None
+
+
+def _deviation(actual: Optional[Decimal], expected: Decimal) \
+        -> Optional[Decimal]:
+    if actual is None or not expected:
+        return None
+    return abs(actual - expected) / expected
+
+
+def check_sale(sale: Mapping, boi_rate: Decimal,
+               threshold: Decimal = DEFAULT_THRESHOLD) -> RateCheck:
+    """ Compare a sale's conversion against the BoI rate on settlement. """
+    implied = 1 / boi_rate
+    rate_dev = _deviation(sale.get('conversion_rate'), implied)
+    usd = sale.get('net_proceeds_usd')
+    proceeds_dev = None
+    if usd is not None:
+        proceeds_dev = _deviation(sale.get('net_proceeds_reqcurr'),
+                                  usd / boi_rate)
+    flagged = any(d is not None and d > threshold
+                  for d in (rate_dev, proceeds_dev))
+    return RateCheck(sale, boi_rate, implied, rate_dev, proceeds_dev, flagged)
+
+
+def reconcile(sales: Iterable[Mapping], fx: FxSingle,
+              threshold: Decimal = DEFAULT_THRESHOLD) -> Reconciliation:
+    """ Check a batch of sales against an FX source in a single pass.
+
+    The sales are sorted by settlement date then merge-joined against the
+    rates in that range, so there's one range scan rather than a lookup
+    (and a possible exception) per sale.
+
+    :param sales: sale mappings as from `load_book`.
+    :param fx: BoI rates for the sales' currency.
+    :param threshold: relative deviation above which a sale is flagged.
+    """
+    unparsed = []
+    dated = []
+    for sale in sales:
+        settled = sale.get('settlement_date')
+        if settled is None or sale.get('conversion_rate') is None:
+            unparsed.append(sale)
+        else:
+            dated.append(sale)
+    dated.sort(key=lambda s: s['settlement_date'])
+
+    checks, unmatched = [], []
+    if dated:
+        rates = fx.iter_rates_over_date_range(dated[0]['settlement_date'],
+                                              dated[-1]['settlement_date'])
+        rate_date: Optional[Date] = None
+        rate: Optional[Decimal] = None
+        for sale in dated:
+            settled = sale['settlement_date']
+            # advance the rates until they catch up with this sale
+            while rate_date is None or rate_date < settled:
+                try:
+                    rate_date, rate = next(rates)
+                except StopIteration:
+                    rate_date = Date.max
+                    break
+            # parse_single keeps a rate it couldn't parse as None
+            if rate_date == settled and rate is not None:
+                checks.append(check_sale(sale, rate, threshold))
+            else:
+                unmatched.append(sale)
+
+    return Reconciliation(checks, unmatched, unparsed, threshold)
+
+
+def report(reconciliation: Reconciliation) -> str:
+    """ A human-readable summary of a reconciliation. """
+    r = reconciliation
+    flagged: Sequence[RateCheck] = r.flagged
+    lines = [
+        f"Sales checked:   {len(r.checks)}",
+        f"Flagged (>{r.threshold:%}): {len(flagged)}",
+        f"No BoI rate:     {len(r.unmatched)}",
+        f"Missing fields:  {len(r.unparsed)}",
+    ]
+    if r.max_deviation is not None:
+        lines.append(f"Max deviation:   {r.max_deviation:.4%}")
+    for check in flagged:
+        sale = check.sale
+        rate_dev = '-' if check.rate_deviation is None \
+            else f"{check.rate_deviation:.4%}"
+        proceeds_dev = '-' if check.proceeds_deviation is None \
+            else f"{check.proceeds_deviation:.4%}"
+        lines.append(
+            f"  order {sale.get('order_number')} settled "
+            f"{sale['settlement_date']}: SPC {sale['conversion_rate']} vs "
+            f"BoI {check.implied_rate:.5f} (rate {rate_dev}, "
+            f"proceeds {proceeds_dev})"
+        )
+    for sale in r.unmatched:
+        lines.append(f"  order {sale.get('order_number')} settled "
+                     f"{sale['settlement_date']}: no BoI rate")
+    return '\n'.join(lines)
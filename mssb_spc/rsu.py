@@ -1,8 +1,12 @@
 from typing import Iterable, MutableMapping, List
-from .common import Table, Cell, xlate_kv, without_empty_columns, content_rows
+from .common import \
+    Table, Cell, xlate_kv, without_empty_columns, content_rows,\
+    resolve_keys, LazyRecord
 
 import pyexcel
 
+from fx.memprofile import stage
+
 
 def rsu_sheet_relevant_rows(rsuz: Iterable[List[Cell]]) -> Table:
     # Get the relevant rows from the sheet
@@ -10,10 +14,21 @@ def rsu_sheet_relevant_rows(rsuz: Iterable[List[Cell]]) -> Table:
     return rows
 
 
-def rsu_table_to_dicts(rsuz: Table) -> Iterable[MutableMapping[str, Cell]]:
-    """ Conversion of a PyExcel Sheet representing RSU details. """
+def rsu_table_to_dicts(rsuz: Table, lazy: bool = False) \
+        -> Iterable[MutableMapping[str, Cell]]:
+    """ Conversion of a PyExcel Sheet representing RSU details.
+
+    :param lazy: give `LazyRecord`s, translating values only when read.
+    """
     rows = iter(rsuz)
     headings = next(rows)  # skip headers
+    if lazy:
+        keys = resolve_keys(headings)
+        return [
+            LazyRecord((k, translator, field)
+                       for (k, translator), field in zip(keys, row))
+            for row in rows
+        ]
     rsuz = [
         dict(xlate_kv(field_name, field)
              for field_name, field in zip(headings, row))
@@ -22,14 +37,17 @@ def rsu_table_to_dicts(rsuz: Table) -> Iterable[MutableMapping[str, Cell]]:
     return rsuz
 
 
-def rsu_sheet_to_rsus(rsu_sheet: pyexcel.Sheet) \
+def rsu_sheet_to_rsus(rsu_sheet: pyexcel.Sheet, lazy: bool = False) \
         -> List[MutableMapping[str, Cell]]:
     """ Convert an RSU sheet from Excel into records of RSUs involved in sale.
 
     :param rsu_sheet: sheet from PyExcel
+    :param lazy: give `LazyRecord`s, translating values only when read.
     :return: list of k:v mappings of RSU data.
     """
-    rows = rsu_sheet_relevant_rows(rsu_sheet.rows())
-    rows = without_empty_columns(rows)
-    rsuz = list(rsu_table_to_dicts(rows))
+    with stage('mssb_spc.rsu_sheet_to_rsus') as profiled:
+        rows = rsu_sheet_relevant_rows(rsu_sheet.rows())
+        rows = without_empty_columns(rows)
+        rsuz = list(rsu_table_to_dicts(rows, lazy))
+        profiled.rows = len(rsuz)
     return rsuz
@@ -2,10 +2,12 @@ from typing import Iterable, MutableMapping
 
 import pyexcel
 
+from fx.memprofile import stage
+
 from .common import \
     Table, Row, Cell,\
     xlate_kv, rows_same_width, without_empty_columns,\
-    to_single_table, split_table_at_heading
+    to_single_table, split_table_at_heading, LazyRecord
 from .error import SaleSheetParseError
 
 
@@ -28,26 +30,35 @@ def sale_sheet_relevant_rows(sheet: Iterable[Row]) -> Table:
     return rows
 
 
-def sales_table_to_dict(table: Table) -> MutableMapping[str, Cell]:
+def sales_table_to_dict(table: Table, lazy: bool = False) \
+        -> MutableMapping[str, Cell]:
     """ By this point every row is a single k/v pair. Now make a dict from it.
 
     :param table: rows of key, value pairs
+    :param lazy: give a `LazyRecord`, translating values only when read.
     :returns: a mapping of normalized keys to normalized values
     :raises ValueError: if there is >0 duplicate headings
     """
     # Ensure no headings will be discarded
     if len(set(r[0] for r in table)) != len(table):
         raise ValueError("Non-unique heading(s) detected")
+    if lazy:
+        return LazyRecord.from_items((k, v) for k, v in table)
     return dict(xlate_kv(k, v) for k, v in table)
 
 
-def sale_sheet_to_dict(sheet: pyexcel.Sheet) -> MutableMapping[str, Cell]:
+def sale_sheet_to_dict(sheet: pyexcel.Sheet, lazy: bool = False) \
+        -> MutableMapping[str, Cell]:
     """ Conversion of a PyExcel Sheet representing a sale to a dict. """
-    rows = sale_sheet_relevant_rows(sheet.rows())
-    if not rows:
-        raise SaleSheetParseError("Sale data couldn't be isolated")
-    rows = rows_same_width(rows)
-    rows = without_empty_columns(rows)
-    table = to_single_table(split_table_at_heading(rows, 'Proceeds Details'))
-    table = sales_table_to_dict(table)
+    with stage('mssb_spc.sale_sheet_to_dict') as profiled:
+        rows = sale_sheet_relevant_rows(sheet.rows())
+        if not rows:
+            raise SaleSheetParseError("Sale data couldn't be isolated")
+        rows = rows_same_width(rows)
+        rows = without_empty_columns(rows)
+        table = to_single_table(
+            split_table_at_heading(rows, 'Proceeds Details')
+        )
+        table = sales_table_to_dict(table, lazy)
+        profiled.rows = 1
     return table
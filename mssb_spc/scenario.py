@@ -0,0 +1,163 @@
+""" What-if gains of lots if they were sold on each of a range of dates.
+
+The gain of a lot sold on a date is the Euro value of its shares at that
+date's share price and FX rate, less its Euro cost: its shares at the
+acquisition price converted at the acquisition date's rate. Fees are
+ignored. For ESPP lots the cost uses the market value at purchase
+(`acquired_fmv`), since the discount is taxed as income; otherwise it's the
+`acquired_price`.
+
+The whole lots x dates matrix is worked out in floating point, one row of an
+`array` per lot, from a vector of Euro share prices computed once per date.
+Any single cell can be recomputed exactly in `Decimal`.
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date as Date, timedelta as TimeDelta
+from decimal import Decimal
+from typing import Iterable, List, Mapping, NamedTuple, Sequence, Tuple, Union
+import csv
+
+from fx.fx import FxSingle
+from fx.error import RateNotAvailableError
+
+from .common import Currency, norm_key, str_iso_to_date, str_us_to_date
+
+# Column names, normalized, that a share price CSV's price may be under
+PRICE_COLUMNS = ('price', 'close', 'adj_close')
+
+# How far back to look for an FX rate when there's none on the day itself
+RATE_LOOKBACK = TimeDelta(days=7)
+
+
+def load_price_csv(file_name: str) -> List[Tuple[Date, Decimal]]:
+    """ Load a share price series from a CSV file.
+
+    The file needs a header row with a `Date` column (ISO or US format) and a
+    `Price` or `Close` column.
+
+    :return: date, price pairs in date order.
+    """
+    with open(file_name, newline='') as fh:
+        reader = csv.reader(fh)
+        headings = [norm_key(h) for h in next(reader)]
+        try:
+            date_idx = headings.index('date')
+            price_idx = next(headings.index(c) for c in PRICE_COLUMNS
+                             if c in headings)
+        except (ValueError, StopIteration):
+            raise ValueError(f"'{file_name}' needs date and price columns")
+        prices = []
+        for row in reader:
+            if not row or not row[date_idx].strip():
+                continue
+            date = row[date_idx].strip()
+            date = str_us_to_date(date) if '/' in date \
+                else str_iso_to_date(date)
+            prices.append((date, Decimal(row[price_idx].strip())))
+    prices.sort()
+    return prices
+
+
+def _rate_on_or_before(fx: FxSingle, date: Date) -> Decimal:
+    """ The FX rate on a date, or the latest in the week before it. """
+    try:
+        return fx.rate_at_date(date)
+    except RateNotAvailableError:
+        rates = list(fx.iter_rates_over_date_range(date - RATE_LOOKBACK, date))
+        if not rates:
+            raise
+        return rates[-1][1]
+
+
+def lot_cost(lot: Mapping) -> Currency:
+    """ The per-share cost of a lot in its own currency. """
+    cost = lot.get('acquired_fmv')
+    if cost is None:
+        cost = lot['acquired_price']
+    return cost
+
+
+class LotSummary(NamedTuple):
+    lot: Mapping
+    min_gain: float
+    max_gain: float
+    mean_gain: float
+    best_date: Date
+    worst_date: Date
+
+
+class Scenario:
+    """ Gains of every lot if sold on every date both a price and rate exist.
+    """
+
+    def __init__(self, lots: Sequence[Mapping],
+                 prices: Iterable[Tuple[Date, Decimal]],
+                 fx: FxSingle, start: Date, end: Date):
+        """
+        :param lots: lots as from `rsu_sheet_to_rsus`/`espp_sheet_to_espps`.
+        :param prices: date, share price pairs, e.g. from `load_price_csv`.
+        :param fx: rates where `convert_from` gives Euro from the share
+            currency, e.g. `boiexcel.load_single(..., 'USD')`.
+        :param start: first date to consider selling on.
+        :param end: last date to consider selling on.
+        """
+        self.lots = list(lots)
+        price_at = {d: p for d, p in prices if start <= d <= end}
+        self.dates: List[Date] = []
+        self._prices: List[Decimal] = []
+        self._rates: List[Decimal] = []
+        for date, rate in fx.iter_rates_over_date_range(start, end):
+            price = price_at.get(date)
+            if price is not None:
+                self.dates.append(date)
+                self._prices.append(price)
+                self._rates.append(rate)
+
+        self._shares = [Decimal(lot['shares']) for lot in self.lots]
+        self._costs: List[Decimal] = [
+            shares * lot_cost(lot)
+            / _rate_on_or_before(fx, lot['acquired_date'])
+            for shares, lot in zip(self._shares, self.lots)
+        ]
+
+        # Everything per date is worked out once; each cell is then a
+        # multiply and subtract.
+        eur_prices = array('d', (float(p / r) for p, r
+                                 in zip(self._prices, self._rates)))
+        self.matrix: List[array] = []
+        for shares, cost in zip(self._shares, self._costs):
+            shares, cost = float(shares), float(cost)
+            self.matrix.append(array('d', (shares * p - cost
+                                           for p in eur_prices)))
+
+    def _date_index(self, date: Union[Date, int]) -> int:
+        if isinstance(date, int):
+            return date
+        i = bisect_left(self.dates, date)
+        if i == len(self.dates) or self.dates[i] != date:
+            raise RateNotAvailableError(f"No price and rate on {date}")
+        return i
+
+    def gain(self, lot: int, date: Union[Date, int]) -> Decimal:
+        """ The exact gain of the lot at an index if sold on a date.
+        :param lot: index of the lot in `lots`.
+        :param date: a date in `dates`, or its index.
+        """
+        j = self._date_index(date)
+        return self._shares[lot] * self._prices[j] / self._rates[j] \
+            - self._costs[lot]
+
+    def summaries(self) -> List[LotSummary]:
+        """ Range and mean of each lot's gain over the dates. """
+        if not self.dates:
+            raise RateNotAvailableError("No dates with both price and rate")
+        summaries = []
+        for lot, row in zip(self.lots, self.matrix):
+            lo = min(range(len(row)), key=row.__getitem__)
+            hi = max(range(len(row)), key=row.__getitem__)
+            summaries.append(LotSummary(lot, row[lo], row[hi],
+                                        sum(row) / len(row),
+                                        self.dates[hi], self.dates[lo]))
+        return summaries
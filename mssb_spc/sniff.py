@@ -0,0 +1,105 @@
+""" Cheaply classify a workbook before fully loading it.
+
+Folders of downloads contain statements, BoI rate files and PDF leftovers as
+well as sale books. Loading each with `load_book` just to get a
+`BookParseError` is slow, so this looks at a file's first bytes, its number
+of sheets and the top rows of its first sheet only.
+"""
+
+from typing import Iterable, Optional
+import enum
+
+import xlrd  # what pyexcel-xls reads .xls with
+
+from .common import Row, PlanType, norm_key
+
+# How many rows of the first sheet to look at
+SNIFF_ROWS = 40
+
+# Leading bytes of files that are certainly not workbooks
+NOT_WORKBOOK_MAGIC = (
+    b'%PDF',  # PDF
+    b'PK\x03\x04',  # zip, e.g. xlsx, which SPC doesn't produce for sales
+)
+
+# Normalized keys of the plan name on a sale sheet
+PLAN_NAME_KEYS = ('plan_name', 'planname')
+
+
+class BookKind(enum.Enum):
+    RSU_SALE = enum.auto()
+    ESPP_SALE = enum.auto()
+    SALE = enum.auto()      # looks like a sale, plan not within sniffed rows
+    NOT_SALE = enum.auto()
+
+    @property
+    def is_sale(self) -> bool:
+        return self is not BookKind.NOT_SALE
+
+    def __str__(self):
+        return str(self.name)
+
+
+def _plan_kind(value) -> Optional[BookKind]:
+    try:
+        plan_type = PlanType.from_s(value)
+    except ValueError:
+        return None
+    return BookKind.RSU_SALE if plan_type is PlanType.RSU \
+        else BookKind.ESPP_SALE
+
+
+def sniff_rows(rows: Iterable[Row]) -> BookKind:
+    """ Classify a sheet from its top rows.
+
+    A sale sheet has an 'Order Details' heading with 'Proceeds Details'
+    beside it, and a 'Plan Name' cell followed by the plan.
+    """
+    markers = False
+    kind = None
+    for row in rows:
+        cells = ['' if c is None else c for c in row]
+        if 'Order Details' in cells and 'Proceeds Details' in cells:
+            markers = True
+        if kind is None:
+            for i, cell in enumerate(cells):
+                if isinstance(cell, str) and norm_key(cell).rstrip(':') \
+                        in PLAN_NAME_KEYS:
+                    value = next((c for c in cells[i + 1:] if c), '')
+                    kind = _plan_kind(value)
+                    break
+        if markers and kind is not None:
+            return kind
+    return BookKind.SALE if markers else BookKind.NOT_SALE
+
+
+def sniff_book(file_name: str, rows: int = SNIFF_ROWS) -> BookKind:
+    """ Classify a workbook file without loading all of it.
+
+    A sale book has the sale sheet and a sheet of lots, so a workbook with
+    fewer than two sheets is rejected from its directory alone, before any
+    sheet is decoded. Otherwise only the first sheet is decoded.
+
+    :param file_name: path of the workbook.
+    :param rows: how many rows of the first sheet to look at.
+    """
+    try:
+        with open(file_name, 'rb') as fh:
+            head = fh.read(8)
+    except OSError:
+        return BookKind.NOT_SALE
+    if not head or head.startswith(NOT_WORKBOOK_MAGIC):
+        return BookKind.NOT_SALE
+    try:
+        book = xlrd.open_workbook(file_name, on_demand=True)
+    except Exception:
+        # whatever xlrd couldn't open isn't a sale book we can load
+        return BookKind.NOT_SALE
+    try:
+        if book.nsheets < 2:
+            return BookKind.NOT_SALE
+        sheet = book.sheet_by_index(0)
+        top = [sheet.row_values(i) for i in range(min(rows, sheet.nrows))]
+    finally:
+        book.release_resources()
+    return sniff_rows(top)
@@ -0,0 +1,200 @@
+""" Persist parsed sales and their lots in a local SQLite database.
+
+There's a column for every field `XLATORS` can produce, typed after its
+translator. Decimals are stored as text so they round-trip exactly, dates as
+ISO text so they sort, and `PlanType`s by name. Sales are keyed by
+`order_number`; saving a sale again replaces it and its lots.
+
+As with `fx.sqlstore`, run `create_schema` once (or use `open_store`, which
+creates the FX tables too), and saving joins any transaction the caller
+has open.
+"""
+
+from typing import Any, Iterable, List, Mapping, MutableMapping
+from datetime import date as Date
+from decimal import Decimal
+import sqlite3
+
+from dictionaries import FrozenOrderedDict
+
+from fx import sqlstore as fx_sqlstore
+from fx.sqlstore import transaction
+
+from .common import \
+    XLATORS, LOT_FIELDS, PlanType, currency, cc_rate, str_us_to_date
+
+# Mapping of translator to (SQL type, to SQL, from SQL)
+_SQL_TYPES = {
+    currency:        ('TEXT',    str,            Decimal),
+    cc_rate:         ('TEXT',    str,            Decimal),
+    str_us_to_date:  ('TEXT',    Date.isoformat, Date.fromisoformat),
+    PlanType.from_s: ('TEXT',    lambda v: v.name, lambda v: PlanType[v]),
+    int:             ('INTEGER', int,            int),
+    str:             ('TEXT',    str,            str),
+}
+
+# Mapping of column name to (SQL type, to SQL, from SQL), in XLATORS order
+COLUMNS = FrozenOrderedDict(
+    (name, _SQL_TYPES[translator])
+    for name, translator in dict(XLATORS.values()).items()
+)
+
+# Column names as a comma-separated list for SQL
+_COLUMN_LIST = ', '.join(COLUMNS)
+
+
+def _column_defs() -> str:
+    return ',\n    '.join(f"{name} {sql_type}"
+                          for name, (sql_type, _, _) in COLUMNS.items()
+                          if name != 'order_number')
+
+
+SCHEMA = (
+    f"""
+    CREATE TABLE IF NOT EXISTS sales (
+        order_number INTEGER PRIMARY KEY,
+        from_file TEXT,
+        {_column_defs()}
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS sales_trade_date ON sales (trade_date)",
+    "CREATE INDEX IF NOT EXISTS sales_settlement_date "
+    "ON sales (settlement_date)",
+    "CREATE INDEX IF NOT EXISTS sales_stock_symbol ON sales (stock_symbol)",
+    f"""
+    CREATE TABLE IF NOT EXISTS lots (
+        sale_order_number INTEGER NOT NULL
+            REFERENCES sales (order_number) ON DELETE CASCADE,
+        lot_field TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        order_number INTEGER,
+        {_column_defs()},
+        PRIMARY KEY (sale_order_number, lot_field, position)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS lots_acquired_date ON lots (acquired_date)",
+)
+
+
+def create_schema(conn: sqlite3.Connection):
+    """ Create the tables and indexes if they're missing.
+
+    Statements are run one at a time, as `executescript` would commit any
+    transaction the caller has open.
+    """
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    """ Connect to a database file, creating sales and FX tables if need be.
+    """
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    fx_sqlstore.create_schema(conn)
+    conn.commit()
+    return conn
+
+
+def _to_row(record: Mapping[str, Any]) -> List[Any]:
+    row = []
+    for name, (_, to_sql, _) in COLUMNS.items():
+        value = record.get(name)
+        row.append(None if value is None else to_sql(value))
+    return row
+
+
+def _from_row(row: sqlite3.Row) -> MutableMapping[str, Any]:
+    record = {}
+    for name, (_, _, from_sql) in COLUMNS.items():
+        value = row[name]
+        if value is not None:
+            record[name] = from_sql(value)
+    return record
+
+
+def save_sales(conn: sqlite3.Connection, sales: Iterable[Mapping]) -> int:
+    """ Insert or replace sales and their lots, see `transaction`.
+
+    :param conn: open database connection.
+    :param sales: sales as from `load_book`; of several with the same order
+        number, e.g. from a workbook downloaded twice, the last is kept.
+    :return: number of sales written.
+    :raises ValueError: if a sale has no order number.
+    """
+    by_order_number = {}
+    for sale in sales:
+        order_number = sale.get('order_number')
+        if order_number is None:
+            raise ValueError("Can't store a sale without an order number")
+        by_order_number[order_number] = sale
+
+    sale_rows, lot_rows, order_numbers = [], [], []
+    for order_number, sale in by_order_number.items():
+        order_numbers.append((order_number,))
+        sale_rows.append([sale.get('_from_file')] + _to_row(sale))
+        for lot_field in LOT_FIELDS:
+            for position, lot in enumerate(sale.get(lot_field) or ()):
+                lot_rows.append(
+                    [order_number, lot_field, position] + _to_row(lot)
+                )
+
+    updates = ', '.join(f"{name} = excluded.{name}"
+                        for name in ('from_file',) + tuple(COLUMNS)
+                        if name != 'order_number')
+    with transaction(conn):
+        conn.executemany(
+            f"INSERT INTO sales (from_file, {_COLUMN_LIST}) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))}) "
+            f"ON CONFLICT (order_number) DO UPDATE SET {updates}",
+            sale_rows
+        )
+        conn.executemany("DELETE FROM lots WHERE sale_order_number = ?",
+                         order_numbers)
+        conn.executemany(
+            f"INSERT INTO lots "
+            f"(sale_order_number, lot_field, position, {_COLUMN_LIST}) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})",
+            lot_rows
+        )
+    return len(sale_rows)
+
+
+def load_sales(conn: sqlite3.Connection, where: str = '',
+               params: Iterable[Any] = ()) -> List[MutableMapping]:
+    """ Load stored sales, with their lots, in settlement date order.
+
+    :param conn: open database connection.
+    :param where: optional SQL condition on the `sales` table, e.g.
+        "stock_symbol = ? AND trade_date >= ?".
+    :param params: parameters for `where`; dates as ISO strings.
+    :return: sales as `load_book` would give them.
+    """
+    row_factory = conn.row_factory
+    conn.row_factory = sqlite3.Row
+    try:
+        sql = "SELECT * FROM sales"
+        if where:
+            sql += f" WHERE {where}"
+        sql += " ORDER BY settlement_date, order_number"
+        sales = {}
+        for row in conn.execute(sql, list(params)):
+            sale = _from_row(row)
+            if row['from_file'] is not None:
+                sale['_from_file'] = row['from_file']
+            sales[row['order_number']] = sale
+
+        if sales:
+            lots = conn.execute(
+                "SELECT * FROM lots WHERE sale_order_number IN "
+                f"(SELECT order_number FROM sales"
+                f"{f' WHERE {where}' if where else ''}) "
+                "ORDER BY sale_order_number, lot_field, position",
+                list(params)
+            )
+            for row in lots:
+                sale = sales[row['sale_order_number']]
+                sale.setdefault(row['lot_field'], []).append(_from_row(row))
+    finally:
+        conn.row_factory = row_factory
+    return list(sales.values())
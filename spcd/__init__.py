@@ -0,0 +1,6 @@
+""" Resident query server keeping FX rates and parsed sales warm in memory.
+
+Each CLI run pays for importing pyexcel and parsing every workbook before it
+can answer a single question. `spcd` loads everything once, watches the
+source files for changes and answers queries over localhost HTTP.
+"""
@@ -0,0 +1,18 @@
+""" Run the server: `python -m spcd [port]`.
+
+Reads the same `MSSB_DATA` and `BOI_FX_PATH` environment variables as
+`main.py`.
+"""
+
+import os
+import sys
+
+from .server import State, serve
+
+MSSB_PATH = os.environ.get('MSSB_DATA', '.')
+BOI_FX_FILE = os.environ.get('BOI_FX_PATH', 'fxrates.xls')
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    serve(State(BOI_FX_FILE, MSSB_PATH), port=port)
@@ -0,0 +1,77 @@
+""" Small client library for the `spcd` server. """
+
+from typing import Iterator, List, MutableMapping, Optional, Tuple
+from datetime import date as Date
+from decimal import Decimal
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from fx.error import RateNotAvailableError
+from mssb_spc.common import PlanType, str_iso_to_date
+
+from . import codec
+
+
+class Error(Exception):
+    """ The server refused or failed a request. """
+
+
+class Client:
+    """ Query a running `spcd` server. """
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:8765',
+                 timeout: float = 10.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _get(self, path: str, **params):
+        params = {k: str(v) for k, v in params.items() if v is not None}
+        url = f"{self.base_url}{path}?{urlencode(params)}"
+        try:
+            with urlopen(url, timeout=self.timeout) as response:
+                return codec.loads(response.read())
+        except HTTPError as e:
+            message = codec.loads(e.read()).get('error', str(e))
+            if e.code == 404 and path in ('/rate', '/convert', '/rates'):
+                raise RateNotAvailableError(message) from None
+            raise Error(message) from None
+
+    def health(self) -> MutableMapping:
+        return self._get('/health')
+
+    def rate_at_date(self, date: Date) -> Decimal:
+        return Decimal(self._get('/rate', date=date.isoformat())['rate'])
+
+    def convert_to(self, date: Date, amount: Decimal) -> Decimal:
+        """ Convert from the "primary" currency to the other at the date. """
+        return Decimal(self._get('/convert', date=date.isoformat(),
+                                 amount=amount, direction='to')['amount'])
+
+    def convert_from(self, date: Date, amount: Decimal) -> Decimal:
+        """ Convert to the "primary" currency from the other at the date. """
+        return Decimal(self._get('/convert', date=date.isoformat(),
+                                 amount=amount, direction='from')['amount'])
+
+    def iter_rates_over_date_range(self, start: Date, end: Date) \
+            -> Iterator[Tuple[Date, Decimal]]:
+        rates = self._get('/rates', start=start.isoformat(),
+                          end=end.isoformat())['rates']
+        for date, rate in rates:
+            yield str_iso_to_date(date), Decimal(rate)
+
+    def sales(self, symbol: Optional[str] = None,
+              plan_type: Optional[PlanType] = None,
+              order_number: Optional[int] = None,
+              start: Optional[Date] = None,
+              end: Optional[Date] = None) -> List[MutableMapping]:
+        """ Sales matching all the given filters, in settlement date order. """
+        found = self._get(
+            '/sales',
+            symbol=symbol,
+            plan_type=plan_type.name if plan_type else None,
+            order_number=order_number,
+            start=start.isoformat() if start else None,
+            end=end.isoformat() if end else None,
+        )['sales']
+        return [codec.decode_record(sale) for sale in found]
@@ -0,0 +1,62 @@
+""" JSON encoding of the library's values for the wire.
+
+Dates travel as ISO strings, Decimals as strings (so they stay exact) and
+`PlanType`s by name. Decoding uses the `XLATORS` table to know which fields
+need turning back into which type.
+"""
+
+from typing import Any, Mapping, MutableMapping
+from datetime import date as Date
+from decimal import Decimal
+import json
+
+from mssb_spc.common import \
+    XLATORS, LOT_FIELDS, PlanType, \
+    currency, cc_rate, str_us_to_date, str_iso_to_date
+
+# Mapping of translated field name to the decoder for its wire value
+DECODERS = {
+    name: {
+        currency: Decimal,
+        cc_rate: Decimal,
+        str_us_to_date: str_iso_to_date,
+        PlanType.from_s: lambda v: PlanType[v],
+    }.get(translator)
+    for name, translator in XLATORS.values()
+}
+
+
+class JSONEncoder(json.JSONEncoder):
+    """ Encode dates, Decimals and PlanTypes losslessly. """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, Date):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return str(o)
+        if isinstance(o, PlanType):
+            return o.name
+        if isinstance(o, Mapping):
+            return dict(o)
+        return super().default(o)
+
+
+def dumps(obj: Any) -> bytes:
+    return json.dumps(obj, cls=JSONEncoder).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    return json.loads(data.decode('utf-8'))
+
+
+def decode_record(record: Mapping[str, Any]) -> MutableMapping[str, Any]:
+    """ Turn a sale or lot record from the wire back into library types. """
+    decoded = {}
+    for k, v in record.items():
+        decoder = DECODERS.get(k)
+        if k in LOT_FIELDS:
+            v = [decode_record(lot) for lot in v]
+        elif decoder is not None and v is not None:
+            v = decoder(v)
+        decoded[k] = v
+    return decoded
@@ -0,0 +1,351 @@
+""" Long-running server answering rate, conversion and sale queries.
+
+The `State` holds an `FxSingle` and every parsed sale. It polls the BoI file
+and the sales folder for changes: only files that are new or whose mtime
+changed are re-parsed, and removed files are dropped.
+
+Queries are answered over HTTP on localhost:
+
+    GET /rate?date=2019-12-20
+    GET /convert?date=2019-12-20&amount=100&direction=to|from
+    GET /rates?start=2019-01-01&end=2019-12-31
+    GET /sales?symbol=XYZ&plan_type=RSU&order_number=1&start=...&end=...
+    GET /health
+"""
+
+from typing import Callable, Mapping, MutableMapping, Optional, Tuple, List
+from datetime import date as Date
+from decimal import Decimal, InvalidOperation
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import logging
+import os
+import threading
+
+from fx.fx import FxSingle
+from fx.error import RateNotAvailableError
+from mssb_spc.common import PlanType, str_iso_to_date
+from mssb_spc.error import BookParseError
+
+from . import codec
+
+log = logging.getLogger(__name__)
+
+# typedefs
+Sale = MutableMapping
+FxLoader = Callable[[str, str], FxSingle]
+SaleLoader = Callable[[str], Sale]
+
+# Extension of files in the sales folder worth trying to parse
+SALE_FILE_EXT = '.xls'
+
+# Seconds between polls of the watched files
+POLL_INTERVAL = 2.0
+
+
+def _default_fx_loader(file_name: str, symbol: str) -> FxSingle:
+    from fx.boiexcel import load_single
+    return load_single(file_name, symbol)
+
+
+def _default_sale_loader(file_name: str) -> Sale:
+    from mssb_spc.book import load_book
+    from mssb_spc.sniff import sniff_book
+    if not sniff_book(file_name).is_sale:
+        raise BookParseError(f"'{file_name}' is not a sale book")
+    return load_book(file_name)
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class State:
+    """ Warm, incrementally refreshed FX table and sales.
+
+    Readers take a reference to `fx` or `sales` and use it; refreshing
+    replaces those attributes wholesale so readers never see a half-update.
+    """
+
+    def __init__(self, fx_file: Optional[str], sales_folder: Optional[str],
+                 symbol: str = 'USD',
+                 fx_loader: FxLoader = _default_fx_loader,
+                 sale_loader: SaleLoader = _default_sale_loader):
+        """
+        :param fx_file: path of the BoI daily rates workbook, if any.
+        :param sales_folder: folder of SPC sale workbooks, if any.
+        :param symbol: currency to load from the BoI workbook.
+        :param fx_loader: called as `fx_loader(fx_file, symbol)`.
+        :param sale_loader: called as `sale_loader(file_name)`.
+        """
+        self.fx_file = fx_file
+        self.sales_folder = sales_folder
+        self.symbol = symbol
+        self._fx_loader = fx_loader
+        self._sale_loader = sale_loader
+        self._lock = threading.Lock()  # serialises refreshes only
+        self._fx_mtime: Optional[float] = None
+        self._seen: Mapping[str, float] = {}  # file name -> mtime parsed
+        self.fx: Optional[FxSingle] = None
+        self.sales: Mapping[str, Sale] = {}   # file name -> sale
+
+    def refresh(self) -> bool:
+        """ Reload whatever changed on disk since the last refresh.
+        :return: whether anything was reloaded or dropped.
+        """
+        with self._lock:
+            changed = self._refresh_fx()
+            changed = self._refresh_sales() or changed
+            return changed
+
+    def _refresh_fx(self) -> bool:
+        if not self.fx_file:
+            return False
+        mtime = _mtime(self.fx_file)
+        if mtime is None or mtime == self._fx_mtime:
+            return False
+        # Don't retry until the file changes again, whatever happens
+        self._fx_mtime = mtime
+        try:
+            fx = self._fx_loader(self.fx_file, self.symbol)
+        except Exception:
+            # e.g. half-copied; keep serving the rates we already have
+            log.exception("Couldn't load FX rates from '%s'", self.fx_file)
+            return False
+        self.fx = fx
+        return True
+
+    def _refresh_sales(self) -> bool:
+        if not self.sales_folder:
+            return False
+        current = {}
+        for file_name in os.listdir(self.sales_folder):
+            if file_name.endswith(SALE_FILE_EXT):
+                path = os.path.join(self.sales_folder, file_name)
+                mtime = _mtime(path)
+                if mtime is not None:
+                    current[path] = mtime
+
+        stale = [path for path, mtime in current.items()
+                 if self._seen.get(path) != mtime]
+        removed = [path for path in self._seen if path not in current]
+        if not stale and not removed:
+            return False
+
+        sales = dict(self.sales)
+        for path in removed:
+            sales.pop(path, None)
+        for path in stale:
+            # either way, its mtime is remembered so it's not re-parsed
+            # until it changes
+            try:
+                sales[path] = self._sale_loader(path)
+            except BookParseError:
+                # not a sale book
+                sales.pop(path, None)
+            except Exception:
+                # a broken or half-copied book mustn't stop the others
+                log.exception("Couldn't load sale book '%s'", path)
+                sales.pop(path, None)
+        self.sales = sales
+        self._seen = current
+        return True
+
+    def watch(self, stop: threading.Event,
+              interval: float = POLL_INTERVAL) -> threading.Thread:
+        """ Start a daemon thread refreshing every `interval` until `stop`. """
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:
+                    # e.g. the folder vanished; try again next time
+                    log.exception("Refresh failed")
+        thread = threading.Thread(target=run, name='spcd-watch', daemon=True)
+        thread.start()
+        return thread
+
+    #
+    # Queries
+    #
+
+    def _fx(self) -> FxSingle:
+        fx = self.fx
+        if fx is None:
+            raise RateNotAvailableError("No FX rates loaded")
+        return fx
+
+    def rate_at_date(self, date: Date) -> Decimal:
+        return self._fx().rate_at_date(date)
+
+    def convert(self, date: Date, amount: Decimal, direction: str) -> Decimal:
+        fx = self._fx()
+        if direction == 'to':
+            return fx.convert_to(date, amount)
+        if direction == 'from':
+            return fx.convert_from(date, amount)
+        raise ValueError(f"Unknown direction '{direction}'")
+
+    def rates(self, start: Date, end: Date) -> List[Tuple[Date, Decimal]]:
+        return list(self._fx().iter_rates_over_date_range(start, end))
+
+    def query_sales(self, symbol: Optional[str] = None,
+                    plan_type: Optional[PlanType] = None,
+                    order_number: Optional[int] = None,
+                    start: Optional[Date] = None,
+                    end: Optional[Date] = None) -> List[Sale]:
+        """ Sales matching all of the given filters.
+
+        `start` and `end` bound the settlement date, inclusive.
+        """
+        found = []
+        for sale in self.sales.values():
+            if symbol is not None and sale.get('stock_symbol') != symbol:
+                continue
+            if plan_type is not None and sale.get('plan_type') is not plan_type:
+                continue
+            if order_number is not None \
+                    and sale.get('order_number') != order_number:
+                continue
+            settled = sale.get('settlement_date')
+            if start is not None and (settled is None or settled < start):
+                continue
+            if end is not None and (settled is None or settled > end):
+                continue
+            found.append(sale)
+        found.sort(key=lambda s: (s.get('settlement_date') or Date.min,
+                                  s.get('order_number') or 0))
+        return found
+
+
+#
+# HTTP
+#
+
+class BadRequest(ValueError):
+    """ The query string couldn't be understood. """
+
+
+def _arg(args: Mapping[str, List[str]], name: str, conv: Callable = str,
+         required: bool = True):
+    values = args.get(name)
+    if not values:
+        if required:
+            raise BadRequest(f"Missing parameter '{name}'")
+        return None
+    try:
+        return conv(values[0])
+    except (ValueError, KeyError, InvalidOperation):
+        raise BadRequest(f"Bad value for parameter '{name}'")
+
+
+class Handler(BaseHTTPRequestHandler):
+    """ Map GET requests onto `State` queries. """
+
+    state: State = None  # set on the server-specific subclass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        args = parse_qs(url.query)
+        route = self.ROUTES.get(url.path)
+        if route is None:
+            return self._reply(HTTPStatus.NOT_FOUND,
+                               {'error': f"No such path '{url.path}'"})
+        try:
+            result = route(self, args)
+        except BadRequest as e:
+            return self._reply(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+        except RateNotAvailableError as e:
+            return self._reply(HTTPStatus.NOT_FOUND, {'error': str(e)})
+        except ArithmeticError as e:  # e.g. a decimal signal on the amount
+            return self._reply(HTTPStatus.BAD_REQUEST,
+                               {'error': f"Can't compute that: {e!r}"})
+        except Exception as e:
+            log.exception("Failed to answer %s", self.path)
+            return self._reply(HTTPStatus.INTERNAL_SERVER_ERROR,
+                               {'error': f"Internal error: {e!r}"})
+        self._reply(HTTPStatus.OK, result)
+
+    def _reply(self, status: HTTPStatus, body):
+        data = codec.dumps(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # keep quiet; this is a local service
+
+    def _health(self, args):
+        state = self.state
+        return {'fx_loaded': state.fx is not None,
+                'sales': len(state.sales)}
+
+    def _rate(self, args):
+        date = _arg(args, 'date', str_iso_to_date)
+        return {'date': date, 'rate': self.state.rate_at_date(date)}
+
+    def _convert(self, args):
+        date = _arg(args, 'date', str_iso_to_date)
+        amount = _arg(args, 'amount', Decimal)
+        direction = _arg(args, 'direction', required=False) or 'to'
+        try:
+            converted = self.state.convert(date, amount, direction)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        return {'date': date, 'amount': converted}
+
+    def _rates(self, args):
+        start = _arg(args, 'start', str_iso_to_date)
+        end = _arg(args, 'end', str_iso_to_date)
+        return {'rates': self.state.rates(start, end)}
+
+    def _sales(self, args):
+        return {'sales': self.state.query_sales(
+            symbol=_arg(args, 'symbol', required=False),
+            plan_type=_arg(args, 'plan_type', lambda v: PlanType[v.upper()],
+                           required=False),
+            order_number=_arg(args, 'order_number', int, required=False),
+            start=_arg(args, 'start', str_iso_to_date, required=False),
+            end=_arg(args, 'end', str_iso_to_date, required=False),
+        )}
+
+    ROUTES = {
+        '/health': _health,
+        '/rate': _rate,
+        '/convert': _convert,
+        '/rates': _rates,
+        '/sales': _sales,
+    }
+
+
+def make_server(state: State, host: str = '127.0.0.1', port: int = 0) \
+        -> ThreadingHTTPServer:
+    """ Build (but don't start) an HTTP server answering from `state`.
+
+    Port 0 picks a free port; see `server.server_address`.
+    """
+    handler = type('StateHandler', (Handler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(state: State, host: str = '127.0.0.1', port: int = 8765,
+          interval: float = POLL_INTERVAL):
+    """ Load everything, then serve and watch for changes until interrupted.
+    """
+    state.refresh()
+    stop = threading.Event()
+    state.watch(stop, interval)
+    server = make_server(state, host, port)
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
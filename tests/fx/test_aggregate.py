@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+from decimal import Decimal
+import random
+
+import pytest
+
+from fx.aggregate import RateAggregateIndex
+from fx.error import RateNotAvailableError
+from fx.memory import MemoryFxSingle
+
+
+START = date(2008, 1, 1)
+
+
+@pytest.fixture(scope='module')
+def series():
+    rnd = random.Random(1)
+    days = sorted(rnd.sample(range(400), 250))
+    return [(START + timedelta(days=d), Decimal(rnd.randint(10000, 20000))
+             / 10000) for d in days]
+
+
+@pytest.fixture(scope='module')
+def index(series):
+    return RateAggregateIndex(reversed(series))
+
+
+def test_aggregates(series, index):
+    rnd = random.Random(2)
+    for _ in range(200):
+        a, b = sorted(rnd.sample(range(-5, 405), 2))
+        start, end = START + timedelta(days=a), START + timedelta(days=b)
+        rates = [r for d, r in series if start <= d <= end]
+        assert index.count(start, end) == len(rates)
+        if not rates:
+            with pytest.raises(RateNotAvailableError):
+                index.mean(start, end)
+            continue
+        assert index.sum(start, end) == sum(rates)
+        assert index.mean(start, end) == sum(rates) / len(rates)
+        assert index.min(start, end) == min(rates)
+        assert index.max(start, end) == max(rates)
+
+
+def test_rolling_mean(series, index):
+    rolling = index.rolling_mean(30)
+    assert len(rolling) == len(series)
+    for d, mean in rolling:
+        rates = [r for e, r in series if d - timedelta(days=29) <= e <= d]
+        assert mean == sum(rates) / len(rates)
+    with pytest.raises(ValueError):
+        index.rolling_mean(0)
+
+
+def test_from_fx(series):
+    fx = MemoryFxSingle('EUR', series)
+    end = START + timedelta(days=100)
+    index = RateAggregateIndex.from_fx(fx, START, end)
+    assert index.count(START, end) == len([d for d, _ in series if d <= end])
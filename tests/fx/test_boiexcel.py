@@ -1,8 +1,12 @@
 from datetime import date
 from decimal import Decimal
 
+import pytest
+
 from . import fxrates
-from fx.boiexcel import parse_single, parse_all
+from fx.boiexcel import \
+    parse_single, parse_all, merge_sorted, PRECEDENCE_LAST,\
+    parse_single_parallel, parse_all_parallel
 
 
 def test_parse_single(fxrates):
@@ -25,4 +29,48 @@ def test_parse_all(fxrates):
         (date(2008, 1, 4), {'BIV': Decimal('3.4'), 'CRB': Decimal('4.4')}),
         (date(2008, 1, 7), {'ABA': Decimal('2.5'), 'CRB': Decimal('4.5')}),
         (date(2008, 1, 8), {'ABA': Decimal('2.6'), 'BIV': Decimal('3.6')}),
-    )
\ No newline at end of file
+    )
+
+
+def test_merge_sorted():
+    d = [date(2008, 1, n) for n in range(1, 6)]
+    streams = [
+        [(d[0], Decimal('1.0')), (d[2], Decimal('1.2'))],
+        [(d[1], Decimal('2.1')), (d[2], Decimal('2.2')), (d[4], None)],
+        [(d[2], Decimal('3.2')), (d[3], Decimal('3.3'))],
+    ]
+    assert list(merge_sorted(streams)) == [
+        (d[0], Decimal('1.0')), (d[1], Decimal('2.1')),
+        (d[2], Decimal('1.2')), (d[3], Decimal('3.3')), (d[4], None),
+    ]
+    assert list(merge_sorted(streams, PRECEDENCE_LAST))[2] \
+        == (d[2], Decimal('3.2'))
+    with pytest.raises(ValueError):
+        list(merge_sorted(streams, 'middle'))
+    with pytest.raises(ValueError):
+        list(merge_sorted([[(d[1], Decimal(1)), (d[0], Decimal(1))]]))
+
+
+def test_merge_sorted_parsed(fxrates):
+    early = [row for row in fxrates if '8 Jan' not in row[1]]
+    late = [fxrates[0]] + [row for row in fxrates[1:] if '1 Jan' not in row[1]]
+    merged = list(merge_sorted([parse_single('ABA', early),
+                                parse_single('ABA', late)]))
+    assert merged == list(parse_single('ABA', fxrates))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 100])
+def test_parse_parallel(fxrates, chunk_size):
+    assert list(parse_single_parallel('ABA', fxrates, 2, chunk_size)) \
+        == list(parse_single('ABA', fxrates))
+    assert list(parse_all_parallel(fxrates, 2, chunk_size)) \
+        == list(parse_all(fxrates))
+    with pytest.raises(ValueError):
+        list(parse_single_parallel('XXX', fxrates, 2, chunk_size))
+    # stops at the first blank row, even with data after it
+    rows = list(fxrates[:4]) + [[''] * 6] + list(fxrates[4:])
+    assert list(parse_single_parallel('ABA', rows, 2, chunk_size)) \
+        == list(parse_single('ABA', rows))
+    assert list(parse_all_parallel(rows, 2, chunk_size)) \
+        == list(parse_all(rows))
+    assert len(list(parse_all(rows))) == 2
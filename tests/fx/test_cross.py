@@ -0,0 +1,55 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from . import fxrates
+from fx.boiexcel import parse_all
+from fx.cross import MemoryFxCross
+from fx.error import RateNotAvailableError
+
+
+@pytest.fixture(scope='module')
+def cross(fxrates):
+    return MemoryFxCross(parse_all(fxrates))
+
+
+def test_cross_rate(cross):
+    assert cross.symbols == ['ABA', 'BIV', 'CRB', 'EUR']
+    assert cross.rate_at_date('ABA', 'CRB', date(2008, 1, 7)) \
+        == Decimal('4.5') / Decimal('2.5')
+    assert cross.rate_at_date('EUR', 'BIV', date(2008, 1, 4)) \
+        == Decimal('3.4')
+    assert cross.rate_at_date('BIV', 'EUR', date(2008, 1, 2)) \
+        == 1 / Decimal('3.2')
+    with pytest.raises(RateNotAvailableError):
+        cross.rate_at_date('ABA', 'BIV', date(2008, 1, 4))  # no ABA
+    with pytest.raises(RateNotAvailableError):
+        cross.rate_at_date('ABA', 'BIV', date(2008, 1, 3))  # no date
+    with pytest.raises(RateNotAvailableError):
+        cross.rate_at_date('ABA', 'XXX', date(2008, 1, 2))
+
+
+def test_cross_series_cached(cross):
+    assert cross.series('aba', 'crb') is cross.series('ABA', 'CRB')
+
+
+def test_convert_many(cross):
+    converted = cross.convert_many('ABA', 'CRB', [
+        (date(2008, 1, 1), Decimal('2.1')),
+        (date(2008, 1, 7), Decimal('5')),
+    ])
+    assert [round(c, 10) for c in converted] \
+        == [Decimal('4.1'), Decimal('9')]
+
+
+def test_cross_pair(cross):
+    pair = cross.pair('ABA', 'BIV')
+    assert list(pair.iter_rates_over_date_range(date(2008, 1, 1),
+                                                date(2008, 1, 31))) == [
+        (date(2008, 1, 1), Decimal('3.1') / Decimal('2.1')),
+        (date(2008, 1, 2), Decimal('3.2') / Decimal('2.2')),
+        (date(2008, 1, 8), Decimal('3.6') / Decimal('2.6')),
+    ]
+    assert round(pair.convert_to(date(2008, 1, 2), Decimal('2.2')), 10) \
+        == Decimal('3.2')
@@ -38,3 +38,9 @@ def test_iter_rates_over_date_range(memory_fx_single):
             )
         ) == [(date(2008, 1, 7), Decimal('2.5')),
               (date(2008, 1, 8), Decimal('2.6'))]
+    assert list(
+            memory_fx_single.iter_rates_over_date_range(
+                date(2008, 1, 2), date(2008, 1, 7)
+            )
+        ) == [(date(2008, 1, 2), Decimal('2.2')),
+              (date(2008, 1, 7), Decimal('2.5'))]
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+import threading
+import tracemalloc
+
+import pyexcel
+import pytest
+
+from fx.boiexcel import load_single, parse_single, STRF_BOI
+from fx.memory import MemoryFxSingle
+from mssb_spc.book import load_book
+from fx import memprofile
+from fx.memprofile import profiling, stage
+
+FX_ROWS = 20000
+LOTS = 2000
+
+# Per-row budgets of bytes retained; generous, but catch regressions in kind
+FX_ROW_BUDGET = 400
+LOT_ROW_BUDGET = 800
+LAZY_LOT_ROW_BUDGET = 1000
+
+
+@pytest.fixture(scope='module')
+def fx_rows():
+    first = date(1999, 1, 4)
+    return [['', '', 'USD', 'GBP']] + [
+        ['', (first + timedelta(days=n)).strftime(STRF_BOI), '1.1234',
+         '0.8765']
+        for n in range(FX_ROWS)
+    ]
+
+
+@pytest.fixture(scope='module')
+def fx_book(tmp_path_factory, fx_rows):
+    file_name = str(tmp_path_factory.mktemp('books') / 'fxrates.xls')
+    names = ['', '', 'US Dollar', 'Sterling']
+    pyexcel.save_as(array=[names] + fx_rows, dest_file_name=file_name)
+    return file_name
+
+
+@pytest.fixture(scope='module')
+def sale_book(tmp_path_factory):
+    sale = [
+        ['Order Details', '', 'Proceeds Details', ''],
+        ['Order Number', 123, 'Gross Proceeds', 1000.5],
+        ['Plan Name', 'RESTRICTED STOCK AWARDS/UNITS', 'Net Proceeds', 990.1],
+        ['Settlement Date', '01/03/2020', 'Stock Symbol', 'XYZ'],
+    ]
+    lots = [
+        ['', '', '', 'PlanName:', '', 'RESTRICTED STOCK AWARDS/UNITS'],
+        ['Acquired Date', 'Transaction Type', 'Acquired Price', 'Shares',
+         'Realized Capital Gain/Loss', ''],
+    ] + [['10/15/2019', 'Release', 180.24, 18, 82.71, '']] * LOTS
+    file_name = str(tmp_path_factory.mktemp('books') / 'sale.xls')
+    # sheets are saved in name order
+    pyexcel.save_book_as(bookdict={'1 Sale': sale, '2 RSU': lots},
+                         dest_file_name=file_name)
+    return file_name
+
+
+def test_stage_is_a_no_op_unless_profiling():
+    assert not tracemalloc.is_tracing()
+    with stage('nothing') as profiled:
+        profiled.rows = 1
+    with profiling() as profile:
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert profile.stages == []
+
+
+def test_nested_stages():
+    with profiling() as profile:
+        with stage('outer') as outer:
+            with stage('inner') as inner:
+                data = [bytes(1000) for _ in range(1000)]
+                inner.rows = len(data)
+            del data
+            outer.rows = 1
+    inner, outer = profile['inner'], profile['outer']
+    assert inner.retained >= 1000 * 1000
+    assert inner.retained_per_row >= 1000
+    assert outer.peak >= inner.peak
+    assert outer.retained < inner.retained
+    assert 'inner' in profile.report()
+
+
+def test_stages_on_other_threads_are_not_recorded():
+    def load():
+        with stage('elsewhere'):
+            with stage('elsewhere inner'):
+                pass
+
+    with profiling() as profile:
+        with stage('here'):
+            thread = threading.Thread(target=load)
+            thread.start()
+            thread.join()
+    assert [s.name for s in profile.stages] == ['here']
+
+
+def test_no_peaks_without_reset_peak(monkeypatch):
+    monkeypatch.setattr(memprofile, 'CAN_RESET_PEAK', False)
+    with profiling() as profile:
+        with stage('old python') as profiled:
+            data = [bytes(1000) for _ in range(10)]
+            profiled.rows = len(data)
+    stats = profile['old python']
+    assert stats.peak is None
+    assert stats.retained >= 10 * 1000
+    assert 'old python' in profile.report()
+
+
+def test_fx_row_budget(fx_rows):
+    with profiling() as profile:
+        fx = MemoryFxSingle('USD', parse_single('USD', fx_rows))
+    stats = profile['fx.MemoryFxSingle']
+    assert stats.rows == len(fx) == FX_ROWS
+    assert stats.retained_per_row < FX_ROW_BUDGET, profile.report()
+
+
+def test_load_single_row_budget(fx_book):
+    with profiling() as profile:
+        fx = load_single(fx_book, 'USD')
+    assert len(fx) == FX_ROWS
+    assert profile['fx.iter_excel.get_book'].peak > 0
+    for name in ('fx.MemoryFxSingle', 'fx.load_single'):
+        stats = profile[name]
+        assert stats.rows == FX_ROWS
+        assert stats.retained_per_row < FX_ROW_BUDGET, profile.report()
+
+
+@pytest.mark.parametrize('lazy, budget', [(False, LOT_ROW_BUDGET),
+                                          (True, LAZY_LOT_ROW_BUDGET)])
+def test_lot_row_budget(sale_book, lazy, budget):
+    with profiling() as profile:
+        sale = load_book(sale_book, lazy=lazy)
+    assert sale['order_number'] == 123
+    stats = profile['mssb_spc.rsu_sheet_to_rsus']
+    assert stats.rows == len(sale['rsus']) == LOTS
+    assert stats.retained_per_row < budget, profile.report()
+    assert profile['mssb_spc.load_book.book_to_sale'].rows == 1
+    assert profile['mssb_spc.load_book.get_book'].peak > 0
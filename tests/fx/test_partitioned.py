@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from fx.error import RateNotAvailableError
+from fx.memory import MemoryFxSingle
+from fx.partitioned import PartitionedFxSingle, write_partitions
+
+START = date(2015, 1, 1)
+RATES = [(START + timedelta(days=n), Decimal(n) / 1000 + 1)
+         for n in range(0, 6 * 365, 3)]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    assert write_partitions(str(tmp_path), 'usd', RATES) \
+        == [2015, 2016, 2017, 2018, 2019, 2020]
+    (tmp_path / 'GBP-2015.tsv').write_text('')
+    return str(tmp_path)
+
+
+def test_partitioned_fx_single(directory):
+    fx = PartitionedFxSingle('USD', directory)
+    memory = MemoryFxSingle('USD', RATES)
+    assert fx.years == [2015, 2016, 2017, 2018, 2019, 2020]
+    assert fx.resident == []
+
+    day, rate = RATES[-1]
+    assert fx.rate_at_date(day) == rate
+    assert fx.resident == [2020]
+    with pytest.raises(RateNotAvailableError):
+        fx.rate_at_date(day - timedelta(days=1))
+    with pytest.raises(RateNotAvailableError):
+        fx.rate_at_date(date(2030, 1, 1))
+
+    start, end = date(2018, 6, 1), date(2019, 6, 1)
+    assert list(fx.iter_rates_over_date_range(start, end)) \
+        == list(memory.iter_rates_over_date_range(start, end))
+    assert fx.resident == [2018, 2019]  # 2020 evicted
+
+
+def test_partitioned_lru(directory):
+    fx = PartitionedFxSingle('USD', directory, max_resident=2)
+    fx.rate_at_date(RATES[0][0])
+    list(fx.iter_rates_over_date_range(date(2016, 1, 1), date(2016, 1, 9)))
+    assert fx.resident == [2015, 2016]
+    fx.rate_at_date(RATES[0][0])  # 2015 is now the most recently used
+    list(fx.iter_rates_over_date_range(date(2017, 1, 1), date(2017, 1, 9)))
+    assert fx.resident == [2015, 2017]
+    with pytest.raises(ValueError):
+        PartitionedFxSingle('USD', directory, max_resident=0)
+
+
+def test_write_partitions_tops_up(directory):
+    fx = PartitionedFxSingle('USD', directory)
+    last_day, last_rate = RATES[-1]
+    assert fx.rate_at_date(last_day) == last_rate
+    newer = [(last_day, Decimal('9')),
+             (last_day + timedelta(days=1), Decimal('9.1')),
+             (date(2021, 1, 4), Decimal('9.2'))]
+    assert write_partitions(directory, 'USD', newer) == [2020, 2021]
+
+    assert fx.rate_at_date(date(2021, 1, 4)) == Decimal('9.2')  # new year
+    assert 2021 in fx.years
+    fx.refresh()
+    assert fx.resident == []
+    assert fx.rate_at_date(last_day) == Decimal('9')
+    assert fx.rate_at_date(last_day + timedelta(days=1)) == Decimal('9.1')
+    assert fx.rate_at_date(RATES[-2][0]) == RATES[-2][1]  # kept from before
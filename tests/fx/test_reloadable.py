@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from decimal import Decimal
+import threading
+
+import pytest
+
+from fx.error import RateNotAvailableError
+from fx.reloadable import ReloadableFxSingle
+
+
+START = date(2008, 1, 1)
+DAYS = 500
+READERS = 16
+RELOADS = 200
+
+
+def table(generation):
+    """ A table where every rate is the generation number. """
+    rate = Decimal(generation)
+    return ((START + timedelta(days=n), rate) for n in range(DAYS))
+
+
+def test_reloadable_fx_single():
+    fx = ReloadableFxSingle('EUR')
+    with pytest.raises(RateNotAvailableError):
+        fx.rate_at_date(START)
+    assert fx.reload(table(1)) == 1
+    assert fx.rate_at_date(START) == Decimal(1)
+
+    # a range started before a reload carries on with the old table
+    rates = fx.iter_rates_over_date_range(START, START + timedelta(days=2))
+    assert next(rates) == (START, Decimal(1))
+    fx.reload(table(2))
+    assert [r for _, r in rates] == [Decimal(1), Decimal(1)]
+    assert fx.rate_at_date(START) == Decimal(2)
+
+
+def test_reloadable_fx_single_concurrent():
+    fx = ReloadableFxSingle('EUR', table(0))
+    stop = threading.Event()
+    errors = []
+    mid = START + timedelta(days=DAYS // 2)
+    end = START + timedelta(days=DAYS - 1)
+
+    def reader():
+        try:
+            last = 0
+            while not stop.is_set():
+                rate = fx.rate_at_date(mid)
+                assert rate >= last  # generations only ever go forward
+                last = rate
+                rates = list(fx.iter_rates_over_date_range(START, end))
+                assert len(rates) == DAYS
+                assert len(set(r for _, r in rates)) == 1  # one snapshot
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+    for generation in range(1, RELOADS + 1):
+        fx.reload(table(generation))
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors[0]
+    assert fx.generation == RELOADS + 1
+    assert fx.rate_at_date(mid) == Decimal(RELOADS)
@@ -0,0 +1,27 @@
+from datetime import date
+from decimal import Decimal
+import sqlite3
+
+from . import fxrates
+from fx.boiexcel import parse_single
+from fx.sqlstore import create_schema, save_rates, load_single
+
+
+def test_round_trip(fxrates):
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn)
+    assert save_rates(conn, 'aba', parse_single('ABA', fxrates)) == 4
+    assert save_rates(conn, 'ABA', [(date(2008, 1, 8), Decimal('2.60001'))]) \
+        == 1
+    fx = load_single(conn, 'ABA')
+    assert list(fx.iter_rates_over_date_range(date(2008, 1, 1),
+                                              date(2008, 12, 31))) == [
+        (date(2008, 1, 1), Decimal('2.1')),
+        (date(2008, 1, 2), Decimal('2.2')),
+        (date(2008, 1, 7), Decimal('2.5')),
+        (date(2008, 1, 8), Decimal('2.60001')),
+    ]
+    assert str(fx.rate_at_date(date(2008, 1, 1))) == '2.10000'
+    fx = load_single(conn, 'ABA', start=date(2008, 1, 2), end=date(2008, 1, 7))
+    assert len(list(fx.iter_rates_over_date_range(date(2008, 1, 1),
+                                                  date(2008, 12, 31)))) == 2
@@ -0,0 +1,27 @@
+from datetime import date
+from decimal import Decimal
+
+from mssb_spc.book import materialise_sale
+from mssb_spc.common import LazyRecord, PlanType
+
+
+def test_materialise_sale():
+    sale = LazyRecord.from_items([('Plan Name', 'RSU'),
+                                  ('Sale Price', 180.5)])
+    sale['rsus'] = [LazyRecord.from_items([('Acquired Date', '10/15/2019')])]
+    sale = materialise_sale(sale)
+    assert type(sale) is dict
+    assert type(sale['rsus'][0]) is dict
+    assert sale == {'plan_type': PlanType.RSU,
+                    'sale_price': Decimal('180.5'),
+                    'rsus': [{'acquired_date': date(2019, 10, 15)}]}
+
+
+def test_materialise_sale_copies_plain_sale():
+    lot = {'acquired_date': date(2019, 10, 15)}
+    sale = {'plan_type': PlanType.RSU, 'rsus': [lot]}
+    copy = materialise_sale(sale)
+    assert copy == sale
+    assert copy is not sale
+    assert copy['rsus'] is not sale['rsus']
+    assert copy['rsus'][0] is not lot
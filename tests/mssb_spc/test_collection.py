@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+import random
+
+from mssb_spc.collection import SaleCollection, Range
+from mssb_spc.common import PlanType
+
+
+def make_sales(n, seed=1):
+    rnd = random.Random(seed)
+    start = date(2015, 1, 1)
+    sales = []
+    for order in range(n):
+        traded = start + timedelta(days=rnd.randrange(2000))
+        plan_type = rnd.choice(list(PlanType))
+        lots = [{'acquired_date': traded - timedelta(days=rnd.randrange(900)),
+                 'shares': rnd.randrange(1, 50)}
+                for _ in range(rnd.randrange(1, 4))]
+        sales.append({
+            'order_number': order,
+            'stock_symbol': rnd.choice(('ABC', 'XYZ')),
+            'plan_type': plan_type,
+            'trade_date': traded,
+            'settlement_date': traded + timedelta(days=2),
+            'status': rnd.choice(('Complete', 'Cancelled')),
+            'rsus' if plan_type is PlanType.RSU else 'espps': lots,
+        })
+    return sales
+
+
+def test_sales_query():
+    sales = make_sales(500)
+    coll = SaleCollection(sales[:300])
+    coll.extend(sales[300:])
+    assert len(coll) == 500
+
+    q3 = Range(date(2017, 7, 1), date(2017, 9, 30))
+    found = coll.sales(stock_symbol='XYZ', plan_type=PlanType.RSU,
+                       settlement_date=q3, status='Complete')
+    expected = [s for s in sales
+                if s['stock_symbol'] == 'XYZ'
+                and s['plan_type'] is PlanType.RSU
+                and s['settlement_date'] in q3
+                and s['status'] == 'Complete']
+    assert found and found == expected
+
+    assert coll.sales(order_number=42) == [sales[42]]
+    assert coll.sales(order_number=500) == []
+    assert coll.sales(trade_date=Range(end=date(2014, 1, 1))) == []
+    assert coll.sales() == sales
+
+
+def test_lots_query():
+    sales = make_sales(200)
+    coll = SaleCollection(sales)
+    before = date(2015, 6, 1)
+    found = coll.lots(acquired_date=Range(end=before),
+                      sale_filters={'stock_symbol': 'ABC'})
+    expected = [(s, lot) for s in sales for field in ('rsus', 'espps')
+                for lot in s.get(field, ())
+                if lot['acquired_date'] <= before
+                and s['stock_symbol'] == 'ABC']
+    assert found
+    assert sorted(id(l) for _, l in found) == sorted(id(l) for _, l in expected)
+
+    assert len(coll.lots()) == sum(len(s.get('rsus', s.get('espps')))
+                                   for s in sales)
+
+
+def test_incremental_add():
+    coll = SaleCollection()
+    sale, = make_sales(1)
+    assert coll.sales(order_number=0) == []
+    coll.add(sale)
+    assert coll.sales(order_number=0) == [sale]
+    assert coll.sales(trade_date=Range(sale['trade_date'],
+                                       sale['trade_date'])) == [sale]
+
+
+def test_equality_on_sorted_fields():
+    sales = make_sales(300)
+    coll = SaleCollection(sales)
+    day = sales[7]['settlement_date']
+    assert coll.sales(settlement_date=day) \
+        == [s for s in sales if s['settlement_date'] == day]
+    lot = sales[7].get('rsus', sales[7].get('espps'))[0]
+    assert lot in [l for _, l in coll.lots(acquired_date=lot['acquired_date'])]
+
+    lookups, rest = coll._plan({'settlement_date': day},
+                               coll._sale_sorted, coll._sale_hashed)
+    assert len(lookups) == 1 and not rest  # from the index, not a scan
@@ -128,3 +128,49 @@ def test_plan_type():
     }
     for test, expected in tests.items():
         assert PlanType.from_s(test) is expected
+
+
+def test_lazy_record():
+    calls = []
+
+    def counting(translator):
+        def translate(v):
+            calls.append(v)
+            return translator(v)
+        return translate
+
+    record = LazyRecord([
+        ('acquired_date', counting(str_us_to_date), '12/20/2019'),
+        ('acquired_price', counting(currency), 12.34),
+        ('conversion_rate', counting(cc_rate), '1 spondoolic'),
+    ])
+    assert not calls
+    assert record['acquired_price'] == Decimal('12.34')
+    assert record['acquired_price'] == Decimal('12.34')
+    assert calls == [12.34]
+    assert list(record) == ['acquired_date', 'acquired_price',
+                            'conversion_rate']
+    record['rsus'] = []
+    del record['acquired_date']
+    assert len(record) == 3
+    assert record.materialise() == {'acquired_price': Decimal('12.34'),
+                                    'conversion_rate': None, 'rsus': []}
+    assert calls == [12.34, '1 spondoolic']
+
+
+def test_lazy_record_contains():
+    record = LazyRecord([('acquired_date', str_us_to_date, 'garbage')])
+    assert 'acquired_date' in record
+    assert 'shares' not in record
+    record['shares'] = 3
+    assert 'shares' in record
+    with pytest.raises(ValueError):
+        record['acquired_date']
+
+
+def test_lazy_record_from_items():
+    items = [('Acquired   Date ', '12/20/2019'), (' Acquired Price', 12.34)]
+    assert LazyRecord.from_items(items) == dict(xlate_kv(k, v)
+                                                for k, v in items)
+    with pytest.raises(KeyError):
+        LazyRecord.from_items([('Not A Heading', 1)])
@@ -1,6 +1,7 @@
 import pytest
 
-from mssb_spc.espp import espp_sheet_relevant_rows
+from mssb_spc.common import LazyRecord
+from mssb_spc.espp import espp_sheet_relevant_rows, espp_table_to_dicts
 
 
 def test_espp_sheet_relevant_rows():
@@ -32,3 +33,18 @@ def test_espp_sheet_relevant_rows():
         ['1/30/2018', 107.3465, 164, 'Share Deposit', 19, 1094.06],
     ]
     assert espp_sheet_relevant_rows(source) == expected
+
+
+def test_espp_table_to_dicts_lazy():
+    table = [
+        ['Acquisition Date', 'Acquired Price',
+         'Acquisition Fair Market Value (FMV)', 'Transaction Type',
+         'Shares Sold', 'Realized Capital Gain/Loss'],
+        ['01/31/2018', 85.442, 130.96, 'Share Deposit', 81, 6438.41],
+        ['1/30/2018', 107.3465, 164, 'Share Deposit', 19, 1094.06],
+    ]
+    eager = espp_table_to_dicts(table)
+    lazy = espp_table_to_dicts(table, lazy=True)
+    assert all(isinstance(lot, LazyRecord) for lot in lazy)
+    assert lazy == eager
+    assert [lot.materialise() for lot in lazy] == eager
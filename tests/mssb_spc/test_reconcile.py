@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fx.memory import MemoryFxSingle
+from mssb_spc.reconcile import reconcile, report
+
+FX = MemoryFxSingle('EUR', [
+    (date(2008, 1, 1), Decimal('1.25')),
+    (date(2008, 1, 2), Decimal('2')),
+    (date(2008, 1, 7), Decimal('1.6')),
+])
+
+
+def sale(order_number, settled, rate, usd=None, eur=None):
+    return {'order_number': order_number, 'settlement_date': settled,
+            'conversion_rate': rate, 'net_proceeds_usd': usd,
+            'net_proceeds_reqcurr': eur}
+
+
+def test_reconcile():
+    sales = [
+        sale(1, date(2008, 1, 7), Decimal('0.625'),
+             Decimal('160'), Decimal('100')),
+        sale(2, date(2008, 1, 2), Decimal('0.6')),           # way off
+        sale(3, date(2008, 1, 1), Decimal('0.8'),
+             Decimal('100'), Decimal('70')),                 # proceeds off
+        sale(4, date(2008, 1, 3), Decimal('0.6')),           # no BoI rate
+        sale(5, date(2008, 1, 2), Decimal('0.501')),         # within 1%
+        sale(6, None, Decimal('0.5')),
+    ]
+    r = reconcile(sales, FX)
+    assert [c.sale['order_number'] for c in r.checks] == [3, 2, 5, 1]
+    assert [c.sale['order_number'] for c in r.flagged] == [3, 2]
+    assert [s['order_number'] for s in r.unmatched] == [4]
+    assert [s['order_number'] for s in r.unparsed] == [6]
+    assert r.checks[0].rate_deviation == Decimal(0)
+    assert r.checks[0].proceeds_deviation == Decimal('0.125')
+    assert r.checks[1].implied_rate == Decimal('0.5')
+    assert r.max_deviation == Decimal('0.2')
+
+    text = report(r)
+    assert 'Sales checked:   4' in text
+    assert 'order 4 settled 2008-01-03: no BoI rate' in text
+
+
+def test_reconcile_unparsed_rate():
+    fx = MemoryFxSingle('EUR', [(date(2008, 1, 1), Decimal('1.25')),
+                                (date(2008, 1, 2), None)])
+    r = reconcile([sale(1, date(2008, 1, 2), Decimal('0.8')),
+                   sale(2, date(2008, 1, 1), Decimal('0.8'))], fx)
+    assert [c.sale['order_number'] for c in r.checks] == [2]
+    assert [s['order_number'] for s in r.unmatched] == [1]
+
+
+def test_reconcile_many():
+    start = date(2000, 1, 1)
+    fx = MemoryFxSingle('EUR', ((start + timedelta(days=n), Decimal('1.25'))
+                                for n in range(5000)))
+    sales = [sale(n, start + timedelta(days=(n * 7919) % 5000),
+                  Decimal('0.8')) for n in range(20000)]
+    r = reconcile(sales, fx)
+    assert len(r.checks) == 20000
+    assert not r.flagged and not r.unmatched
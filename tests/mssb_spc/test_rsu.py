@@ -1,6 +1,7 @@
 import pytest
 
-from mssb_spc.rsu import rsu_sheet_relevant_rows
+from mssb_spc.common import LazyRecord
+from mssb_spc.rsu import rsu_sheet_relevant_rows, rsu_table_to_dicts
 
 
 def test_rsu_sheet_relevant_rows():
@@ -39,3 +40,16 @@ def test_rsu_sheet_relevant_rows():
         ['10/15/2019', 'Release', 180.24, 33, 151.64, ''],
         ['10/15/2019', 'Release', 180.24, 11, 50.55, '']]
     assert rsu_sheet_relevant_rows(source) == expected
+
+
+def test_rsu_table_to_dicts_lazy():
+    table = [
+        ['Acquired Date', 'Transaction Type', 'Acquired Price', 'Shares'],
+        ['10/15/2019', 'Release', 180.24, 18],
+        ['10/16/2019', 'Release', 180.25, 33],
+    ]
+    eager = rsu_table_to_dicts(table)
+    lazy = rsu_table_to_dicts(table, lazy=True)
+    assert all(isinstance(lot, LazyRecord) for lot in lazy)
+    assert lazy == eager
+    assert [lot.materialise() for lot in lazy] == eager
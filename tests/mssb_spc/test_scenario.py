@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from fx.error import RateNotAvailableError
+from fx.memory import MemoryFxSingle
+from mssb_spc.scenario import Scenario, load_price_csv
+
+START = date(2020, 1, 1)
+
+FX = MemoryFxSingle('EUR', [
+    (date(2019, 10, 14), Decimal('1.1')),  # a lot acquired on the 15th
+    (date(2020, 1, 1), Decimal('1.25')),
+    (date(2020, 1, 2), Decimal('1.6')),
+    (date(2020, 1, 3), Decimal('2')),
+    (date(2020, 1, 6), Decimal('1.5')),
+])
+
+LOTS = [
+    {'acquired_date': date(2019, 10, 14), 'acquired_price': Decimal('110'),
+     'shares': 10},
+    {'acquired_date': date(2019, 10, 15), 'acquired_price': Decimal('90'),
+     'acquired_fmv': Decimal('110'), 'shares': 1},
+]
+
+
+@pytest.fixture
+def prices(tmp_path):
+    csv = tmp_path / 'prices.csv'
+    csv.write_text('Date,Open,Close\n'
+                   '2020-01-06,1,150\n'
+                   '01/01/2020,1,125\n'
+                   '2020-01-02,1,160\n'
+                   '2020-01-04,1,999\n')
+    return load_price_csv(str(csv))
+
+
+def test_load_price_csv(prices):
+    assert prices == [(date(2020, 1, 1), Decimal('125')),
+                      (date(2020, 1, 2), Decimal('160')),
+                      (date(2020, 1, 4), Decimal('999')),
+                      (date(2020, 1, 6), Decimal('150'))]
+
+
+def test_scenario(prices):
+    s = Scenario(LOTS, prices, FX, START, START + timedelta(days=30))
+    assert s.dates == [date(2020, 1, 1), date(2020, 1, 2), date(2020, 1, 6)]
+    assert s.gain(0, date(2020, 1, 1)) == Decimal('0')
+    assert s.gain(0, 1) == Decimal('0')
+    assert s.gain(1, date(2020, 1, 6)) == Decimal('0')
+    assert s.gain(0, date(2020, 1, 6)) == Decimal('0')
+    assert [list(row) for row in s.matrix] == [[0.0] * 3, [0.0] * 3]
+    with pytest.raises(RateNotAvailableError):
+        s.gain(0, date(2020, 1, 3))
+
+
+def test_scenario_summaries():
+    prices = [(START + timedelta(days=n), Decimal(100 + n)) for n in range(5)]
+    fx = MemoryFxSingle('EUR', [(START + timedelta(days=n), Decimal('1.25'))
+                                for n in range(-90, 5)])
+    lots = [{'acquired_date': START - timedelta(days=60),
+             'acquired_price': Decimal('100'), 'shares': 5}]
+    s = Scenario(lots, prices, fx, START, START + timedelta(days=4))
+    summary, = s.summaries()
+    assert summary.best_date == START + timedelta(days=4)
+    assert summary.worst_date == START
+    assert summary.min_gain == 0.0
+    assert summary.max_gain == pytest.approx(16.0)
+    assert summary.mean_gain == pytest.approx(8.0)
+    assert s.gain(0, 4) == Decimal('16')
@@ -0,0 +1,45 @@
+import pyexcel
+
+from mssb_spc.sniff import BookKind, sniff_rows, sniff_book
+
+
+SALE_TOP = [
+    ['', '', '', '', ''],
+    ['Order Details', '', '', 'Proceeds Details', ''],
+    ['Order Number', 12, '', 'Gross Proceeds', 1.0],
+    ['Plan Name', '', 'RESTRICTED STOCK AWARDS/UNITS', 'Total Fees', 0.1],
+]
+
+
+def test_sniff_rows():
+    assert sniff_rows(SALE_TOP) is BookKind.RSU_SALE
+    espp = [row[:] for row in SALE_TOP]
+    espp[3][2] = 'ESPP'
+    assert sniff_rows(espp) is BookKind.ESPP_SALE
+    assert sniff_rows(SALE_TOP[:3]) is BookKind.SALE
+    assert sniff_rows([['', '', 'ABA', 'BIV'], ['', '1 Jan 08', 1, 2]]) \
+        is BookKind.NOT_SALE
+    assert sniff_rows([]) is BookKind.NOT_SALE
+
+
+def test_sniff_book(tmp_path):
+    sale = tmp_path / 'sale.xls'
+    # sheets are saved in name order
+    pyexcel.save_book_as(bookdict={'1 Sale': SALE_TOP + [['x'] * 5] * 100,
+                                   '2 RSU': [['Acquired Date']]},
+                         dest_file_name=str(sale))
+    assert sniff_book(str(sale)) is BookKind.RSU_SALE
+
+    one_sheet = tmp_path / 'one_sheet.xls'
+    pyexcel.save_as(array=SALE_TOP, dest_file_name=str(one_sheet))
+    assert sniff_book(str(one_sheet)) is BookKind.NOT_SALE
+
+    pdf = tmp_path / 'sale.pdf.xls'
+    pdf.write_bytes(b'%PDF-1.4\n...')
+    assert sniff_book(str(pdf)) is BookKind.NOT_SALE
+
+    junk = tmp_path / 'junk.xls'
+    junk.write_bytes(b'not a workbook at all')
+    assert sniff_book(str(junk)) is BookKind.NOT_SALE
+
+    assert sniff_book(str(tmp_path / 'missing.xls')) is BookKind.NOT_SALE
@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+import sqlite3
+
+import pytest
+
+from mssb_spc.common import PlanType
+from mssb_spc.sqlstore import \
+    create_schema, open_store, save_sales, load_sales
+
+
+def sale(order_number, settled, gain='82.71'):
+    return {
+        'order_number': order_number,
+        'plan_type': PlanType.RSU,
+        'stock_symbol': 'XYZ',
+        'trade_date': settled,
+        'settlement_date': settled,
+        'conversion_rate': Decimal('0.87'),
+        'net_proceeds_usd': Decimal('1234.10'),
+        'shares': 62,
+        '_from_file': f'/sales/{order_number}.xls',
+        'rsus': [
+            {'acquired_date': date(2019, 10, 15), 'transaction_type':
+             'Release', 'acquired_price': Decimal('180.24'), 'shares': 18,
+             'gain': Decimal(gain)},
+            {'acquired_date': date(2019, 10, 15), 'transaction_type':
+             'Release', 'acquired_price': Decimal('180.24'), 'shares': 44,
+             'gain': Decimal('151.64')},
+        ],
+    }
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_round_trip(conn):
+    sales = [sale(2, date(2020, 1, 3)), sale(1, date(2019, 12, 20))]
+    assert save_sales(conn, sales) == 2
+    assert load_sales(conn) == sales[::-1]
+    assert load_sales(conn, 'settlement_date >= ?', ['2020-01-01']) \
+        == sales[:1]
+
+
+def test_upsert(conn):
+    save_sales(conn, [sale(1, date(2019, 12, 20))])
+    replacement = sale(1, date(2019, 12, 21), gain='0.01')
+    del replacement['rsus'][1]
+    save_sales(conn, [replacement])
+    assert load_sales(conn) == [replacement]
+    assert conn.execute("SELECT count(*) FROM lots").fetchone() == (1,)
+
+
+def test_needs_order_number(conn):
+    with pytest.raises(ValueError):
+        save_sales(conn, [{'stock_symbol': 'XYZ'}])
+
+
+def test_load_keeps_caller_transaction(conn):
+    conn.execute("INSERT INTO sales (order_number) VALUES (7)")
+    assert conn.in_transaction
+    load_sales(conn)
+    assert conn.in_transaction
+    conn.rollback()
+    assert load_sales(conn) == []
+
+
+def test_saves_join_caller_transaction(conn):
+    conn.execute("INSERT INTO sales (order_number) VALUES (7)")
+    save_sales(conn, [sale(1, date(2019, 12, 20))])
+    save_sales(conn, [sale(2, date(2020, 1, 3))])
+    conn.rollback()
+    assert load_sales(conn) == []
+
+    save_sales(conn, [sale(1, date(2019, 12, 20))])  # commits by itself
+    conn.rollback()
+    assert [s['order_number'] for s in load_sales(conn)] == [1]
+
+
+def test_open_store(tmp_path):
+    path = str(tmp_path / 'store.db')
+    conn = open_store(path)
+    save_sales(conn, [sale(1, date(2019, 12, 20))])
+    conn.close()
+    conn = open_store(path)
+    assert [s['order_number'] for s in load_sales(conn)] == [1]
+    assert conn.execute("SELECT count(*) FROM fx_rates").fetchone() == (0,)
+    conn.close()
+
+
+def test_duplicate_order_numbers(conn):
+    first = sale(1, date(2019, 12, 20))
+    last = sale(1, date(2019, 12, 21), gain='0.01')
+    assert save_sales(conn, [first, sale(2, date(2020, 1, 3)), last]) == 2
+    assert load_sales(conn, 'order_number = ?', [1]) == [last]
+    assert conn.execute("SELECT count(*) FROM lots").fetchone() == (4,)
@@ -0,0 +1,152 @@
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+import os
+import threading
+
+import pytest
+
+from fx.error import RateNotAvailableError
+from fx.memory import MemoryFxSingle
+from fx.boiexcel import parse_single
+from mssb_spc.common import PlanType
+from mssb_spc.error import BookParseError
+from spcd.server import State, make_server
+from spcd.client import Client, Error
+
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+DATA_FILE = DATA_PATH / 'fxrates.tsv'
+
+
+def fx_loader(file_name, symbol):
+    with open(DATA_FILE) as fh:
+        rows = tuple(x.split('\t') for x in fh)[1:]
+    return MemoryFxSingle(symbol, parse_single('ABA', rows))
+
+
+def sale_loader(file_name):
+    text = Path(file_name).read_text()
+    if not text.startswith('sale'):
+        raise BookParseError(file_name)
+    _, order_number, settled = text.split()
+    return {
+        'order_number': int(order_number),
+        'plan_type': PlanType.RSU,
+        'stock_symbol': 'XYZ',
+        'settlement_date': date.fromisoformat(settled),
+        'net_proceeds_usd': Decimal('100.01'),
+        'rsus': [{'acquired_date': date(2019, 10, 15), 'shares': 3}],
+    }
+
+
+@pytest.fixture
+def state(tmp_path):
+    fx_file = tmp_path / 'fxrates.xls'
+    fx_file.write_text('')
+    sales = tmp_path / 'sales'
+    sales.mkdir()
+    (sales / 'a.xls').write_text('sale 1 2008-01-02')
+    (sales / 'junk.xls').write_text('statement')
+    (sales / 'notes.txt').write_text('sale 9 2008-01-02')
+    return State(str(fx_file), str(sales),
+                 fx_loader=fx_loader, sale_loader=sale_loader)
+
+
+@pytest.fixture
+def client(state):
+    state.refresh()
+    server = make_server(state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield Client(f'http://{host}:{port}')
+    server.shutdown()
+    server.server_close()
+
+
+def test_refresh_is_incremental(state):
+    assert state.refresh()
+    assert [s['order_number'] for s in state.sales.values()] == [1]
+    assert not state.refresh()
+
+    folder = Path(state.sales_folder)
+    (folder / 'b.xls').write_text('sale 2 2008-01-08')
+    assert state.refresh()
+    assert sorted(s['order_number'] for s in state.sales.values()) == [1, 2]
+
+    (folder / 'a.xls').unlink()
+    assert state.refresh()
+    assert [s['order_number'] for s in state.sales.values()] == [2]
+
+
+def test_client_rates(client):
+    assert client.health() == {'fx_loaded': True, 'sales': 1}
+    assert client.rate_at_date(date(2008, 1, 2)) == Decimal('2.2')
+    with pytest.raises(RateNotAvailableError):
+        client.rate_at_date(date(2008, 1, 3))
+    assert client.convert_to(date(2008, 1, 2), Decimal('10')) \
+        == Decimal('22.0')
+    assert client.convert_from(date(2008, 1, 2), Decimal('22')) \
+        == Decimal('10')
+    assert list(client.iter_rates_over_date_range(date(2008, 1, 3),
+                                                  date(2008, 1, 7))) \
+        == [(date(2008, 1, 7), Decimal('2.5'))]
+
+
+def test_client_sales(client):
+    sale, = client.sales(plan_type=PlanType.RSU, end=date(2008, 1, 2))
+    assert sale['order_number'] == 1
+    assert sale['plan_type'] is PlanType.RSU
+    assert sale['settlement_date'] == date(2008, 1, 2)
+    assert sale['net_proceeds_usd'] == Decimal('100.01')
+    assert sale['rsus'] == [{'acquired_date': date(2019, 10, 15),
+                             'shares': 3}]
+    assert client.sales(symbol='NOPE') == []
+    assert client.sales(start=date(2008, 1, 3)) == []
+
+
+def test_refresh_survives_broken_files(state, caplog):
+    def flaky_loader(file_name):
+        if file_name.endswith('bad.xls'):
+            raise KeyError('Unknown Heading')
+        return sale_loader(file_name)
+
+    state._sale_loader = flaky_loader
+    folder = Path(state.sales_folder)
+    (folder / 'bad.xls').write_text('sale 3 2008-01-02')
+    assert state.refresh()
+    assert [s['order_number'] for s in state.sales.values()] == [1]
+    assert 'bad.xls' in caplog.text
+    assert not state.refresh()  # not retried until it changes
+
+    (folder / 'good.xls').write_text('sale 2 2008-01-08')
+    assert state.refresh()
+    assert sorted(s['order_number'] for s in state.sales.values()) == [1, 2]
+
+
+def test_refresh_keeps_fx_on_failed_reload(state):
+    state.refresh()
+    fx = state.fx
+
+    def broken_loader(file_name, symbol):
+        raise ValueError('half-copied')
+
+    state._fx_loader = broken_loader
+    os.utime(state.fx_file, (0, 0))
+    assert not state.refresh()
+    assert state.fx is fx
+
+
+def test_client_errors(client, state, monkeypatch, caplog):
+    with pytest.raises(Error):
+        client.convert_to(date(2008, 1, 2), Decimal('sNaN'))
+
+    def broken(date):
+        raise RuntimeError('oops')
+
+    monkeypatch.setattr(state, 'rate_at_date', broken)
+    with pytest.raises(Error, match='oops'):
+        client.rate_at_date(date(2008, 1, 2))
+    assert 'oops' in caplog.text
+    assert client.health() == {'fx_loaded': True, 'sales': 1}